@@ -3,14 +3,19 @@
 from __future__ import annotations
 
 import fnmatch
+import logging
 import os
+import re
 import sys
 import tempfile
+from collections.abc import Sequence
 from dataclasses import dataclass, field
-from functools import cached_property
+from functools import lru_cache
 from pathlib import Path
 from typing import Literal
 
+logger = logging.getLogger(__name__)
+
 # =============================================================================
 # Platform-Specific Default Blocked Paths
 # =============================================================================
@@ -66,6 +71,11 @@ DEFAULT_ALLOWED_WRITE = [
 ]
 
 
+# Immutable defaults shared by every SecurityConfig() instead of per-instance copies
+_DEFAULT_BLOCKED = tuple(get_default_blocked())
+_DEFAULT_ALLOWED_WRITE = tuple(DEFAULT_ALLOWED_WRITE)
+
+
 # =============================================================================
 # Path Helper Functions
 # =============================================================================
@@ -100,23 +110,121 @@ def normalize_for_match(path: str) -> str:
     - Converts to forward slashes
     - Lowercases on Windows (case-insensitive filesystem)
 
+    Normalization is purely textual: symlinks are not followed, matching the
+    fnmatch semantics of the configured patterns. Results are memoized.
+    Relative paths depend on the working directory, so it is part of the
+    cache key for them.
+
     Args:
         path: Path to normalize.
 
     Returns:
         Normalized path string for matching.
     """
-    # Normalize to an absolute path while preserving Windows short-name segments
-    absolute = os.path.abspath(os.path.expanduser(path))
+    cwd = "" if path.startswith("~") or os.path.isabs(path) else os.getcwd()
+    return _normalize_cached(path, cwd)
 
-    # Convert to forward slashes
-    normalized = absolute.replace("\\", "/")
 
-    # Case-insensitive on Windows
-    if sys.platform == "win32":
-        normalized = normalized.lower()
+def _match_form_windows(absolute: str) -> str:
+    """Forward slashes, lowercased (case-insensitive filesystem)."""
+    return absolute.replace("\\", "/").lower()
+
+
+def _match_form_posix(absolute: str) -> str:
+    """Forward slashes, case preserved."""
+    return absolute.replace("\\", "/")
+
+
+# Platform is fixed for the process lifetime, so pick the variant once
+_to_match_form = _match_form_windows if sys.platform == "win32" else _match_form_posix
+
+
+@lru_cache(maxsize=4096)
+def _normalize_cached(path: str, cwd: str) -> str:
+    """Uncached body of normalize_for_match(), keyed by (path, cwd)."""
+    if path.startswith("~"):
+        path = os.path.expanduser(path)
+    # Normalize to an absolute path while preserving Windows short-name segments.
+    # Joining the cwd we already looked up keeps abspath() from querying it again.
+    return _to_match_form(os.path.abspath(os.path.join(cwd, path)))
+
+
+def clear_match_caches() -> None:
+    """Drop memoized path normalizations and compiled patterns."""
+    _normalize_cached.cache_clear()
+    _compile_pattern.cache_clear()
+
+
+@lru_cache(maxsize=256)
+def _compile_pattern(norm_pattern: str) -> re.Pattern[str]:
+    """Translate a normalized glob pattern into a compiled regex.
+
+    Args:
+        norm_pattern: Pattern already passed through normalize_for_match().
+
+    Returns:
+        Compiled regex equivalent to fnmatch on the normalized pattern.
+    """
+    return re.compile(fnmatch.translate(norm_pattern))
+
+
+def compile_pattern(pattern: str) -> re.Pattern[str]:
+    """Expand, normalize and compile a glob pattern for matching.
+
+    Args:
+        pattern: Glob pattern with possible ~ or ${TEMP} placeholders.
+
+    Returns:
+        Compiled regex to match against normalize_for_match() output.
+    """
+    return _compile_pattern(normalize_for_match(expand_pattern(pattern)))
+
+
+# Stand-in for an empty pattern list
+_NEVER_MATCHES = re.compile(r"(?!)")
 
-    return normalized
+
+# Literal directory prefixes plus one regex for the remaining patterns
+_Matchers = tuple[tuple[str, ...], re.Pattern[str]]
+
+
+def split_patterns(patterns: Sequence[str]) -> _Matchers:
+    """Split glob patterns into literal directory prefixes and one combined regex.
+
+    Patterns of the form "<literal>/*" (or "<literal>/**") match exactly the
+    paths starting with "<literal>/", since fnmatch's * also matches "/". They
+    can be checked with str.startswith instead of a regex.
+    The remaining patterns are joined into a single alternation so a path is
+    checked with one regex match regardless of how many patterns there are.
+
+    Args:
+        patterns: Glob patterns with possible ~ or ${TEMP} placeholders.
+
+    Returns:
+        Tuple of (normalized literal prefixes, compiled regex for the rest).
+    """
+    prefixes: list[str] = []
+    translated: list[str] = []
+    for pattern in patterns:
+        norm_pattern = normalize_for_match(expand_pattern(pattern))
+        prefix = norm_pattern.rstrip("*")
+        if prefix != norm_pattern and prefix.endswith("/") and not _has_magic(prefix):
+            prefixes.append(prefix)
+        else:
+            translated.append(fnmatch.translate(norm_pattern))
+    regex = re.compile("|".join(translated)) if translated else _NEVER_MATCHES
+    return tuple(prefixes), regex
+
+
+def _matches_any(norm_path: str, matchers: _Matchers) -> bool:
+    """Check a normalized path against split_patterns() output."""
+    prefixes, regex = matchers
+    return norm_path.startswith(prefixes) or regex.match(norm_path) is not None
+
+
+def _has_magic(pattern: str) -> bool:
+    """Check if a pattern contains glob wildcard characters."""
+    return any(c in pattern for c in "*?[")
 
 
 def matches_pattern(path: str, pattern: str) -> bool:
@@ -133,10 +241,7 @@ def matches_pattern(path: str, pattern: str) -> bool:
     Returns:
         True if path matches pattern.
     """
-    norm_path = normalize_for_match(path)
-    norm_pattern = normalize_for_match(expand_pattern(pattern))
-
-    return fnmatch.fnmatch(norm_path, norm_pattern)
+    return compile_pattern(pattern).match(normalize_for_match(path)) is not None
 
 
 # =============================================================================
@@ -144,29 +249,39 @@ def matches_pattern(path: str, pattern: str) -> bool:
 # =============================================================================
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SecurityConfig:
     """Security configuration for script execution.
 
+    Derived state (expanded and compiled patterns) is built once at
+    construction; the config is frozen so it can never go stale.
+
     Attributes:
         mode: "unrestricted" blocks system dirs only, "sandboxed" also restricts writes.
         blocked_patterns: Glob patterns for paths that cannot be accessed.
         allowed_write_patterns: Glob patterns for writable paths (sandboxed mode only).
+        blocked_expanded: Blocked patterns with ~ and ${TEMP} expanded.
+        allowed_write_expanded: Allowed write patterns with ~ and ${TEMP} expanded.
     """
 
     mode: Literal["unrestricted", "sandboxed"] = "unrestricted"
-    blocked_patterns: list[str] = field(default_factory=get_default_blocked)
-    allowed_write_patterns: list[str] = field(default_factory=lambda: DEFAULT_ALLOWED_WRITE.copy())
-
-    @cached_property
-    def blocked_expanded(self) -> list[str]:
-        """Blocked patterns with ~ and ${TEMP} expanded."""
-        return [expand_pattern(p) for p in self.blocked_patterns]
-
-    @cached_property
-    def allowed_write_expanded(self) -> list[str]:
-        """Allowed write patterns with ~ and ${TEMP} expanded."""
-        return [expand_pattern(p) for p in self.allowed_write_patterns]
+    blocked_patterns: Sequence[str] = _DEFAULT_BLOCKED
+    allowed_write_patterns: Sequence[str] = _DEFAULT_ALLOWED_WRITE
+    blocked_expanded: list[str] = field(init=False, repr=False, compare=False)
+    allowed_write_expanded: list[str] = field(init=False, repr=False, compare=False)
+    _blocked_matchers: _Matchers = field(init=False, repr=False, compare=False)
+    _allowed_write_matchers: _Matchers = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Expand and compile patterns once for repeated path checks."""
+        derived = {
+            "blocked_expanded": [expand_pattern(p) for p in self.blocked_patterns],
+            "allowed_write_expanded": [expand_pattern(p) for p in self.allowed_write_patterns],
+            "_blocked_matchers": split_patterns(self.blocked_patterns),
+            "_allowed_write_matchers": split_patterns(self.allowed_write_patterns),
+        }
+        for name, value in derived.items():
+            object.__setattr__(self, name, value)
 
     def is_path_blocked(self, path: str, for_write: bool = False) -> bool:
         """Check if a path is blocked by security policy.
@@ -178,18 +293,16 @@ class SecurityConfig:
         Returns:
             True if access should be denied.
         """
+        norm_path = normalize_for_match(path)
+
         # Check against blocked patterns (applies to both modes)
-        for pattern in self.blocked_patterns:
-            if matches_pattern(path, pattern):
-                return True
+        if _matches_any(norm_path, self._blocked_matchers):
+            return True
 
         # In sandboxed mode, writes must be to allowed paths
         if for_write and self.mode == "sandboxed":
-            for pattern in self.allowed_write_patterns:
-                if matches_pattern(path, pattern):
-                    return False
             # Write not in allowlist = blocked
-            return True
+            return not _matches_any(norm_path, self._allowed_write_matchers)
 
         return False
 
@@ -199,6 +312,21 @@ class SecurityConfig:
 # =============================================================================
 
 
+def _dedupe_patterns(patterns: list[str]) -> list[str]:
+    """Drop repeated patterns (keeping first occurrence) and intern the rest.
+
+    Args:
+        patterns: Patterns in configuration order.
+
+    Returns:
+        Unique, interned patterns in their original order.
+    """
+    unique = [sys.intern(p) for p in dict.fromkeys(patterns)]
+    if len(unique) < len(patterns):
+        logger.debug("Ignored %d duplicate path pattern(s)", len(patterns) - len(unique))
+    return unique
+
+
 def load_config() -> SecurityConfig:
     """Load security configuration from environment variables.
 
@@ -211,6 +339,9 @@ def load_config() -> SecurityConfig:
     Returns:
         SecurityConfig instance with merged settings.
     """
+    # Environment (home, temp dir) may have changed since the last load
+    clear_match_caches()
+
     # Get mode
     mode_str = os.environ.get("ARCHICAD_MCP_SECURITY", "unrestricted").lower()
     mode: Literal["unrestricted", "sandboxed"] = (
@@ -232,8 +363,8 @@ def load_config() -> SecurityConfig:
 
     return SecurityConfig(
         mode=mode,
-        blocked_patterns=blocked,
-        allowed_write_patterns=allowed_write,
+        blocked_patterns=_dedupe_patterns(blocked),
+        allowed_write_patterns=_dedupe_patterns(allowed_write),
     )
 
 
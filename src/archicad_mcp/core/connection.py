@@ -1,5 +1,10 @@
 """Connection to a single Archicad instance."""
 
+import json
+from collections.abc import Callable, Mapping
+from types import MappingProxyType
+from typing import Any
+
 import aiohttp
 
 from archicad_mcp.core.errors import (
@@ -7,6 +12,133 @@ from archicad_mcp.core.errors import (
     CommandError,
     TapirNotAvailableError,
 )
+from archicad_mcp.models import ArchicadInstance, ProjectType
+
+
+def _dumps_stdlib(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON with the standard library."""
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+# orjson (the "fast" extra) is an optional speedup for request/response (de)serialization
+_json_dumps: Callable[[Any], bytes]
+_json_loads: Callable[[bytes], Any]
+try:
+    import orjson
+except ImportError:
+    _json_dumps = _dumps_stdlib
+    _json_loads = json.loads
+else:
+
+    def _dumps_orjson(obj: Any) -> bytes:
+        """Serialize with orjson, deferring to the standard library where they differ.
+
+        orjson rejects non-string keys and integers beyond 64 bits, which the
+        standard library encodes, and writes NaN/Infinity as null. Payloads that
+        fail, or contain a null that may have been a non-finite float, are
+        re-encoded with the standard library.
+        """
+        try:
+            data = orjson.dumps(obj)
+        except TypeError:
+            return _dumps_stdlib(obj)
+        return _dumps_stdlib(obj) if b"null" in data else data
+
+    def _loads_orjson(data: bytes) -> Any:
+        """Parse with orjson, retrying with the standard library on its stricter errors.
+
+        The standard library also accepts NaN/Infinity literals and out-of-range
+        numbers. Note orjson parses integers beyond 64 bits as floats.
+        """
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+
+    _json_dumps = _dumps_orjson
+    _json_loads = _loads_orjson
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+TAPIR_NAMESPACE = "TapirCommand"
+
+# Project names reported when no saved project is open
+_PLACEHOLDER_PROJECT_NAMES = frozenset({"Unknown", "Untitled"})
+
+# Archicad error code for an unknown add-on command (the add-on itself is present)
+COMMAND_NOT_FOUND_CODE = 4010
+
+# Actionable suggestions for built-in API error codes
+ERROR_SUGGESTIONS: Mapping[int, str] = MappingProxyType(
+    {
+        # Add known error codes here as we discover them
+    }
+)
+
+
+def _encode_payload(command: str, payload: Mapping[str, object]) -> bytes:
+    """Serialize a request body, reporting unserializable parameters as a command error.
+
+    Args:
+        command: Command name, for the error details.
+        payload: Request body.
+
+    Returns:
+        UTF-8 JSON bytes.
+
+    Raises:
+        CommandError: If the payload cannot be encoded as JSON.
+    """
+    try:
+        return _json_dumps(payload)
+    except (TypeError, ValueError) as e:
+        raise CommandError(
+            "Command parameters are not JSON-serializable",
+            details={"command": command, "error": str(e)},
+            suggestion="Pass only dicts, lists, strings, numbers, booleans, and None",
+        ) from e
+
+
+def _decode_response(command: str, body: bytes) -> dict[str, object]:
+    """Parse a response body, reporting malformed JSON as a command error.
+
+    Args:
+        command: Command name, for the error details.
+        body: Raw response bytes.
+
+    Returns:
+        Parsed response.
+
+    Raises:
+        CommandError: If the body is not valid JSON.
+    """
+    try:
+        data: dict[str, object] = _json_loads(body)
+    except ValueError as e:
+        raise CommandError(
+            "Archicad returned an invalid JSON response",
+            details={"command": command, "error": str(e)},
+        ) from e
+    return data
+
+
+def tapir_payload(command: str, parameters: dict[str, object]) -> dict[str, object]:
+    """Build the API.ExecuteAddOnCommand request body for a Tapir command.
+
+    Args:
+        command: Tapir command name.
+        parameters: Command parameters.
+
+    Returns:
+        JSON-serializable request payload.
+    """
+    return {
+        "command": "API.ExecuteAddOnCommand",
+        "parameters": {
+            "addOnCommandId": {"commandNamespace": TAPIR_NAMESPACE, "commandName": command},
+            "addOnCommandParameters": parameters,
+        },
+    }
 
 
 class ArchicadConnection:
@@ -31,6 +163,28 @@ class ArchicadConnection:
         # Use tapirAvailable from probing if provided, otherwise None (unknown)
         tapir_val = info.get("tapirAvailable")
         self._tapir_available: bool | None = tapir_val if isinstance(tapir_val, bool) else None
+        self.project_type: ProjectType
+        if self.is_teamwork:
+            self.project_type = "teamwork"
+        elif self.project_name in _PLACEHOLDER_PROJECT_NAMES:
+            self.project_type = "untitled"
+        else:
+            self.project_type = "solo"
+        self._instance: ArchicadInstance | None = None
+
+    def to_instance(self) -> ArchicadInstance:
+        """Describe this connection, reusing the last snapshot while it is current."""
+        is_tapir_available = self._tapir_available is True
+        if self._instance is None or self._instance.is_tapir_available != is_tapir_available:
+            self._instance = ArchicadInstance(
+                port=self.port,
+                project_name=self.project_name,
+                project_path=str(self.project_path) if self.project_path else None,
+                project_type=self.project_type,
+                archicad_version=self.version,
+                is_tapir_available=is_tapir_available,
+            )
+        return self._instance
 
     async def execute(
         self,
@@ -58,10 +212,11 @@ class ArchicadConnection:
     ) -> dict[str, object]:
         """Execute built-in Archicad API command."""
         payload = {"command": command, "parameters": parameters}
+        body = _encode_payload(command, payload)
 
         try:
-            async with self.session.post(self.url, json=payload) as resp:
-                data: dict[str, object] = await resp.json(content_type=None)
+            async with self.session.post(self.url, data=body, headers=_JSON_HEADERS) as resp:
+                raw = await resp.read()
         except aiohttp.ClientError as e:
             raise ArchicadConnectionError(
                 f"Cannot connect to Archicad on port {self.port}",
@@ -69,6 +224,8 @@ class ArchicadConnection:
                 suggestion="Ensure Archicad is running with JSON API enabled",
             ) from e
 
+        data = _decode_response(command, raw)
+
         if not data.get("succeeded"):
             error = data.get("error", {})
             if isinstance(error, dict):
@@ -102,20 +259,12 @@ class ArchicadConnection:
                 ),
             )
 
-        payload = {
-            "command": "API.ExecuteAddOnCommand",
-            "parameters": {
-                "addOnCommandId": {
-                    "commandNamespace": "TapirCommand",
-                    "commandName": command,
-                },
-                "addOnCommandParameters": parameters,
-            },
-        }
+        payload = tapir_payload(command, parameters)
+        body = _encode_payload(command, payload)
 
         try:
-            async with self.session.post(self.url, json=payload) as resp:
-                data: dict[str, object] = await resp.json(content_type=None)
+            async with self.session.post(self.url, data=body, headers=_JSON_HEADERS) as resp:
+                raw = await resp.read()
         except aiohttp.ClientError as e:
             raise ArchicadConnectionError(
                 f"Cannot connect to Archicad on port {self.port}",
@@ -123,6 +272,8 @@ class ArchicadConnection:
                 suggestion="Ensure Archicad is running",
             ) from e
 
+        data = _decode_response(command, raw)
+
         if not data.get("succeeded"):
             error = data.get("error", {})
             error_msg = ""
@@ -131,11 +282,18 @@ class ArchicadConnection:
                 error_msg = str(error.get("message", ""))
                 error_code = error.get("code")
 
+            # Command not found in Tapir (code 4010) - Tapir IS available
+            if error_code == COMMAND_NOT_FOUND_CODE:
+                self._tapir_available = True
+                raise CommandError(
+                    f"Unknown Tapir command: {command}",
+                    details={"command": command, "code": error_code},
+                    suggestion="Check command name with get_docs(search='...')",
+                )
+
             # Detect Tapir not installed: Archicad returns "not registered" errors
             # when the add-on namespace or add-on itself is missing.
-            # Code 4010 = command not found (Tapir IS installed, just wrong command name)
-            is_addon_missing = error_code != 4010 and "not registered" in error_msg.lower()
-            if is_addon_missing:
+            if "not registered" in error_msg.lower():
                 self._tapir_available = False
                 raise TapirNotAvailableError(
                     "Tapir add-on is not installed",
@@ -146,15 +304,6 @@ class ArchicadConnection:
                     ),
                 )
 
-            # Command not found in Tapir (code 4010) - Tapir IS available
-            if error_code == 4010:
-                self._tapir_available = True
-                raise CommandError(
-                    f"Unknown Tapir command: {command}",
-                    details={"command": command, "code": error_code},
-                    suggestion="Check command name with get_docs(search='...')",
-                )
-
             if isinstance(error, dict):
                 raise CommandError(
                     str(error.get("message", "Command failed")),
@@ -211,11 +360,9 @@ class ArchicadConnection:
             self._tapir_available = True
             return True
 
-    def _suggest_fix(self, error_code: object) -> str:
+    @staticmethod
+    def _suggest_fix(error_code: object) -> str:
         """Return actionable suggestion based on error code."""
-        suggestions: dict[int, str] = {
-            # Add known error codes here as we discover them
-        }
         if isinstance(error_code, int):
-            return suggestions.get(error_code, "Check command parameters")
+            return ERROR_SUGGESTIONS.get(error_code, "Check command parameters")
         return "Check command parameters"
@@ -2,10 +2,12 @@
 
 import asyncio
 import logging
+import time
+from collections.abc import Iterable
 
 import aiohttp
 
-from archicad_mcp.core.connection import ArchicadConnection
+from archicad_mcp.core.connection import ArchicadConnection, tapir_payload
 from archicad_mcp.core.errors import ArchicadConnectionError
 from archicad_mcp.models import ArchicadInstance
 
@@ -13,6 +15,29 @@ logger = logging.getLogger(__name__)
 
 PORT_RANGE = range(19723, 19744)
 
+# Closed localhost ports refuse immediately; anything slower to connect is not Archicad
+PROBE_TIMEOUT = aiohttp.ClientTimeout(total=1.0, sock_connect=0.2)
+
+# refresh() skips ports that keep failing; the delay doubles per failure up to the cap.
+# The cap stays short because list_instances relies on refresh() to find new instances.
+BACKOFF_INITIAL = 1.0
+BACKOFF_MAX = 15.0
+
+
+def create_session() -> aiohttp.ClientSession:
+    """Create the shared HTTP session for all Archicad traffic.
+
+    The pool must hold one connection per port in PORT_RANGE so a scan never
+    queues probes behind each other, with headroom for script commands.
+    """
+    return aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=300),
+        connector=aiohttp.TCPConnector(
+            keepalive_timeout=60,
+            limit=64,  # Max concurrent connections (> len(PORT_RANGE))
+        ),
+    )
+
 
 class ConnectionManager:
     """Manages connections to multiple Archicad instances.
@@ -24,32 +49,59 @@ class ConnectionManager:
     def __init__(self, session: aiohttp.ClientSession) -> None:
         self.session = session
         self.connections: dict[int, ArchicadConnection] = {}
+        self._backoff: dict[int, tuple[float, float]] = {}  # port -> (last probe, delay)
 
     async def scan_and_connect(self) -> None:
         """Scan all ports and connect to active instances."""
-        tasks = [self._probe_port(port) for port in PORT_RANGE]
+        await self._probe_ports(PORT_RANGE)
+
+    async def _probe_ports(self, ports: Iterable[int]) -> None:
+        """Probe the given ports concurrently."""
+        tasks = [self._probe_port(port) for port in ports]
         await asyncio.gather(*tasks, return_exceptions=True)
 
+    def _mark_dead(self, port: int) -> None:
+        """Record a failed probe and grow the port's backoff delay."""
+        _, delay = self._backoff.get(port, (0.0, BACKOFF_INITIAL / 2))
+        self._backoff[port] = (time.monotonic(), min(delay * 2, BACKOFF_MAX))
+
+    def _is_backing_off(self, port: int, now: float) -> bool:
+        """Check if a dead port was probed too recently to probe again."""
+        if port not in self._backoff:
+            return False
+        last_probe, delay = self._backoff[port]
+        return now - last_probe < delay
+
     async def _probe_port(self, port: int) -> None:
         """Check if Archicad is running on port and get info."""
         url = f"http://127.0.0.1:{port}"
 
+        # A port already known to be Archicad gets its project info requested
+        # alongside the product probe, so a refresh costs one round-trip. New
+        # ports only get a Tapir request once the probe confirms Archicad.
+        project_task = (
+            asyncio.create_task(self._get_project_info(port)) if port in self.connections else None
+        )
+
         try:
             async with self.session.post(
                 url,
                 json={"command": "API.GetProductInfo", "parameters": {}},
-                timeout=aiohttp.ClientTimeout(total=1.0),
+                timeout=PROBE_TIMEOUT,
             ) as resp:
                 if resp.status != 200:
                     self.connections.pop(port, None)
+                    self._mark_dead(port)
                     return
                 data: dict[str, object] = await resp.json(content_type=None)
                 if data.get("succeeded"):
                     result = data.get("result", {})
                     if isinstance(result, dict):
-                        info = await self._get_full_info(port, result)
+                        project_info = await (project_task or self._get_project_info(port))
+                        info = {"version": result.get("version"), **project_info}
                         was_new = port not in self.connections
                         self.connections[port] = ArchicadConnection(port, self.session, info)
+                        self._backoff.pop(port, None)
                         if was_new:
                             logger.info(
                                 "Found Archicad on port %d (%s)",
@@ -58,32 +110,23 @@ class ConnectionManager:
                             )
         except (TimeoutError, aiohttp.ClientError):
             # Port not responding, remove if was connected
+            self._mark_dead(port)
             if self.connections.pop(port, None):
                 logger.info("Lost Archicad on port %d", port)
+        finally:
+            # No-op if already awaited; otherwise the port is no longer Archicad
+            if project_task is not None:
+                project_task.cancel()
 
-    async def _get_full_info(
-        self,
-        port: int,
-        product_info: dict[str, object],
-    ) -> dict[str, object]:
-        """Get complete instance info (product + project)."""
-        info: dict[str, object] = {"version": product_info.get("version")}
+    async def _get_project_info(self, port: int) -> dict[str, object]:
+        """Get project info via Tapir (may fail if not installed or no project)."""
+        info: dict[str, object] = {}
 
-        # Try to get project info via Tapir (may fail if not installed or no project)
         try:
             async with self.session.post(
                 f"http://127.0.0.1:{port}",
-                json={
-                    "command": "API.ExecuteAddOnCommand",
-                    "parameters": {
-                        "addOnCommandId": {
-                            "commandNamespace": "TapirCommand",
-                            "commandName": "GetProjectInfo",
-                        },
-                        "addOnCommandParameters": {},
-                    },
-                },
-                timeout=aiohttp.ClientTimeout(total=2.0),
+                json=tapir_payload("GetProjectInfo", {}),
+                timeout=aiohttp.ClientTimeout(total=2.0, sock_connect=0.2),
             ) as resp:
                 data: dict[str, object] = await resp.json(content_type=None)
                 if data.get("succeeded"):
@@ -102,8 +145,24 @@ class ConnectionManager:
         return info
 
     async def refresh(self) -> None:
-        """Re-scan all ports."""
-        await self.scan_and_connect()
+        """Re-scan ports, skipping recently dead ones that are backing off.
+
+        Connected ports are always probed so disconnects are noticed promptly.
+        """
+        now = time.monotonic()
+        await self._probe_ports(
+            [p for p in PORT_RANGE if p in self.connections or not self._is_backing_off(p, now)]
+        )
+
+    async def get_or_connect(self, port: int) -> ArchicadConnection:
+        """Get connection by port, probing only that port if not yet connected.
+
+        Lets tools reach an instance started after the last scan without
+        waiting for a full scan of PORT_RANGE.
+        """
+        if port not in self.connections and port in PORT_RANGE:
+            await self._probe_port(port)
+        return self.get(port)
 
     def get(self, port: int) -> ArchicadConnection:
         """Get connection by port, raise if not found."""
@@ -117,24 +176,4 @@ class ConnectionManager:
 
     def get_instances(self) -> list[ArchicadInstance]:
         """Get info for all connected instances."""
-        instances = []
-        for conn in self.connections.values():
-            # Determine project type
-            if conn.is_teamwork:
-                project_type = "teamwork"
-            elif conn.project_name in ("Unknown", "Untitled"):
-                project_type = "untitled"
-            else:
-                project_type = "solo"
-
-            instances.append(
-                ArchicadInstance(
-                    port=conn.port,
-                    project_name=conn.project_name,
-                    project_path=str(conn.project_path) if conn.project_path else None,
-                    project_type=project_type,  # type: ignore[arg-type]
-                    archicad_version=conn.version,
-                    is_tapir_available=conn._tapir_available is True,
-                )
-            )
-        return instances
+        return [conn.to_instance() for conn in self.connections.values()]
@@ -2,24 +2,84 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
+import re
+import sys
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from itertools import chain
+from operator import itemgetter
+from types import ModuleType
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from archicad_mcp.core.connection import ArchicadConnection
 
+# Fuzzy matching is optional; resolved once instead of per property
+_fuzz: ModuleType | None
+_fuzz_process: ModuleType | None
+try:
+    from rapidfuzz import fuzz as _fuzz
+    from rapidfuzz import process as _fuzz_process
+except ImportError:
+    _fuzz = None
+    _fuzz_process = None
+
+
+logger = logging.getLogger(__name__)
+
+# Distinct bad group queries remembered per port before the memo is reset
+_SIMILAR_GROUPS_MEMO_SIZE = 256
+
+_INTERNED_FIELDS = ("propertyGroupName", "propertyType", "propertyMeasureType")
+
 
 def _normalize(text: str) -> str:
     """Normalize text for case-insensitive comparison."""
     return text.lower().strip()
 
 
+def prepare_properties(properties: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Precompute normalized lookup keys on raw property dicts.
+
+    Adds "_name_lower", "_group_lower", and "_guid" so filtering, searching,
+    and formatting don't recompute them on every call, and interns the group,
+    type, and measure fields. Idempotent: already prepared properties are left
+    untouched.
+
+    Args:
+        properties: List of raw properties from API (modified in place)
+
+    Returns:
+        The same list, for chaining
+    """
+    for prop in properties:
+        if "_name_lower" not in prop:
+            # Low-cardinality fields share one string object per distinct value
+            for key in _INTERNED_FIELDS:
+                value = prop.get(key)
+                if isinstance(value, str):
+                    prop[key] = sys.intern(value)
+            prop["_name_lower"] = _normalize(prop.get("propertyName", ""))
+            prop["_group_lower"] = sys.intern(_normalize(prop.get("propertyGroupName", "")))
+            prop["_guid"] = _property_guid(prop)
+    return properties
+
+
+def _property_guid(prop: dict[str, Any]) -> str:
+    """Extract the property GUID, tolerating a missing or malformed propertyId."""
+    prop_id = prop.get("propertyId", {})
+    return prop_id.get("guid", "") if isinstance(prop_id, dict) else ""
+
+
 def _format_property(prop: dict[str, Any]) -> dict[str, Any]:
     """Format raw API property to output format."""
-    prop_id = prop.get("propertyId", {})
     return {
         "name": prop.get("propertyName", ""),
         "group": prop.get("propertyGroupName", ""),
-        "guid": prop_id.get("guid", "") if isinstance(prop_id, dict) else "",
+        "guid": prop["_guid"] if "_guid" in prop else _property_guid(prop),
         "type": prop.get("propertyType", ""),
         "value_type": prop.get("propertyValueType", ""),
         "measure_type": prop.get("propertyMeasureType", "Default"),
@@ -35,28 +95,158 @@ class PropertyCache:
 
     def __init__(self) -> None:
         self._cache: dict[int, list[dict[str, Any]]] = {}  # port -> properties
+        self._word_indexes: dict[int, dict[str, list[dict[str, Any]]]] = {}
+        self._name_indexes: dict[int, dict[str, dict[str, Any]]] = {}
+        self._buckets: dict[int, PropertyBuckets] = {}
+        self._groups_summaries: dict[int, list[dict[str, Any]]] = {}
+        self._type_summaries: dict[int, dict[str, int]] = {}
+        self._similar_groups: dict[int, dict[str, list[str]]] = {}  # port -> query -> groups
+        # port -> in-flight GetAllProperties, shared by prefetch and get_properties
+        self._fetches: dict[int, asyncio.Task[list[dict[str, Any]]]] = {}
 
     async def get_properties(self, conn: ArchicadConnection) -> list[dict[str, Any]]:
         """Get all properties for the connection, caching on first call.
 
+        A fetch already in flight for the port (e.g. the startup prefetch) is
+        awaited instead of sending a second GetAllProperties.
+
         Args:
             conn: Archicad connection
 
         Returns:
             List of raw property dicts from GetAllProperties
         """
-        if conn.port not in self._cache:
-            result = await conn.execute("GetAllProperties", {})
-            props: list[dict[str, Any]] = result.get("properties", [])  # type: ignore[assignment]
-            self._cache[conn.port] = props
+        if conn.port in self._cache:
+            return self._cache[conn.port]
+        # Shielded so one cancelled caller doesn't cancel the fetch for the others
+        return await asyncio.shield(self._fetch(conn))
+
+    async def prefetch(self, conns: Iterable[ArchicadConnection]) -> None:
+        """Fetch properties for several connections concurrently.
+
+        Ports already cached are skipped. Failures are logged and left
+        uncached so get_properties retries them on demand. Cancelling the
+        prefetch cancels its in-flight fetches.
+
+        Args:
+            conns: Archicad connections to warm the cache for
+        """
+        pending = [conn for conn in conns if conn.port not in self._cache]
+        results = await asyncio.gather(
+            *(self._fetch(conn) for conn in pending),
+            return_exceptions=True,
+        )
+        for conn, result in zip(pending, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.debug("Property prefetch failed on port %d: %s", conn.port, result)
+
+    def _fetch(self, conn: ArchicadConnection) -> asyncio.Task[list[dict[str, Any]]]:
+        """Start the port's GetAllProperties fetch, or join the one in flight."""
+        task = self._fetches.get(conn.port)
+        if task is None:
+            task = asyncio.create_task(self._fetch_and_store(conn))
+            self._fetches[conn.port] = task
+        return task
+
+    async def _fetch_and_store(self, conn: ArchicadConnection) -> list[dict[str, Any]]:
+        """Fetch, prepare, and index the properties of one port."""
+        try:
+            self._store(conn.port, await conn.execute("GetAllProperties", {}))
+        finally:
+            # Failed fetches are retried by the next caller
+            self._fetches.pop(conn.port, None)
         return self._cache[conn.port]
 
+    def _store(self, port: int, result: dict[str, object]) -> None:
+        """Prepare and index a GetAllProperties result for a port."""
+        props: list[dict[str, Any]] = result.get("properties", [])  # type: ignore[assignment]
+        self._cache[port] = prepare_properties(props)
+        self._word_indexes[port] = build_word_index(self._cache[port])
+        self._name_indexes[port] = build_name_index(self._cache[port])
+        self._buckets[port] = build_property_buckets(self._cache[port])
+
+    def get_word_index(self, port: int) -> dict[str, list[dict[str, Any]]] | None:
+        """Get the name word index for a cached port, if properties were fetched."""
+        return self._word_indexes.get(port)
+
+    def get_name_index(self, port: int) -> dict[str, dict[str, Any]] | None:
+        """Get the exact name index for a cached port, if properties were fetched."""
+        return self._name_indexes.get(port)
+
+    def get_buckets(self, port: int) -> PropertyBuckets | None:
+        """Get the group/type/measure buckets for a cached port, if fetched."""
+        return self._buckets.get(port)
+
+    def get_groups_summary(self, port: int) -> list[dict[str, Any]]:
+        """Get the group summary for a cached port, computed once per fetch."""
+        if port not in self._groups_summaries and port in self._cache:
+            self._groups_summaries[port] = get_groups_summary(self._cache[port])
+        return self._groups_summaries.get(port, [])
+
+    def get_type_summary(self, port: int) -> dict[str, int]:
+        """Get the type summary for a cached port, computed once per fetch."""
+        if port not in self._type_summaries and port in self._cache:
+            self._type_summaries[port] = get_type_summary(self._cache[port])
+        return self._type_summaries.get(port, {})
+
+    def get_similar_groups(self, port: int, query: str) -> list[str]:
+        """Find groups similar to query for a cached port, memoized per query.
+
+        Retries tend to repeat the same bad group name, so the group scan and
+        fuzzy match run at most once per distinct query.
+        """
+        if port not in self._cache:
+            return []
+        memo = self._similar_groups.setdefault(port, {})
+        key = _normalize(query)
+        if key not in memo:
+            if len(memo) >= _SIMILAR_GROUPS_MEMO_SIZE:
+                memo.clear()
+            memo[key] = find_similar_groups(self._cache[port], query)
+        return memo[key]
+
     def clear(self, port: int | None = None) -> None:
         """Clear cache for a specific port or all ports."""
-        if port is not None:
-            self._cache.pop(port, None)
-        else:
-            self._cache.clear()
+        per_port = (
+            self._cache,
+            self._word_indexes,
+            self._name_indexes,
+            self._buckets,
+            self._groups_summaries,
+            self._type_summaries,
+            self._similar_groups,
+        )
+        for store in per_port:
+            if port is not None:
+                store.pop(port, None)
+            else:
+                store.clear()
+
+
+@dataclass(frozen=True, slots=True)
+class PropertyBuckets:
+    """Catalog positions of properties grouped by filterable field."""
+
+    by_group: dict[str, list[int]]  # lowercase group -> positions
+    by_type: dict[str, list[int]]
+    by_measure: dict[str, list[int]]
+
+
+def build_property_buckets(properties: list[dict[str, Any]]) -> PropertyBuckets:
+    """Bucket property positions by group, type, and measure.
+
+    Args:
+        properties: List of raw properties from API
+
+    Returns:
+        PropertyBuckets with positions in catalog order
+    """
+    buckets = PropertyBuckets(by_group={}, by_type={}, by_measure={})
+    for i, prop in enumerate(prepare_properties(properties)):
+        buckets.by_group.setdefault(prop["_group_lower"], []).append(i)
+        buckets.by_type.setdefault(prop.get("propertyType", ""), []).append(i)
+        buckets.by_measure.setdefault(prop.get("propertyMeasureType", "Default"), []).append(i)
+    return buckets
 
 
 def filter_properties(
@@ -65,6 +255,7 @@ def filter_properties(
     group: str | None = None,
     property_type: str | None = None,
     measure_type: str | None = None,
+    buckets: PropertyBuckets | None = None,
 ) -> list[dict[str, Any]]:
     """Filter properties by group, type, and measure.
 
@@ -73,34 +264,118 @@ def filter_properties(
         group: Filter by group name (case-insensitive, partial match)
         property_type: Filter by type (StaticBuiltIn, DynamicBuiltIn, Custom)
         measure_type: Filter by measure (Length, Area, Volume, Angle, Default)
+        buckets: Optional buckets from build_property_buckets for exactly
+            these properties; only the smallest matching bucket is scanned.
+            Building them already prepared the properties, so the full
+            prepare pass is skipped
 
     Returns:
         Filtered list of properties
     """
-    results = properties
-
+    if buckets is not None:
+        if not (group or property_type or measure_type):
+            return properties
+        results = [
+            properties[i] for i in _smallest_bucket(buckets, group, property_type, measure_type)
+        ]
+    else:
+        results = prepare_properties(properties)
+        if not (group or property_type or measure_type):
+            return results
+
+    # One pass over the candidates with every active filter applied
+    group_lower = _normalize(group) if group else None
+    return [
+        p
+        for p in results
+        if (group_lower is None or group_lower in p["_group_lower"])
+        and (not property_type or p.get("propertyType") == property_type)
+        and (not measure_type or p.get("propertyMeasureType", "Default") == measure_type)
+    ]
+
+
+def _smallest_bucket(
+    buckets: PropertyBuckets,
+    group: str | None,
+    property_type: str | None,
+    measure_type: str | None,
+) -> list[int]:
+    """Positions of the most selective active filter, in catalog order."""
+    candidates: list[list[int]] = []
+    if property_type:
+        candidates.append(buckets.by_type.get(property_type, []))
+    if measure_type:
+        candidates.append(buckets.by_measure.get(measure_type, []))
     if group:
         group_lower = _normalize(group)
-        results = [p for p in results if group_lower in _normalize(p.get("propertyGroupName", ""))]
+        matching = [idx for g, idx in buckets.by_group.items() if group_lower in g]
+        if len(matching) == 1:
+            candidates.append(matching[0])
+        elif not candidates or sum(map(len, matching)) < min(map(len, candidates)):
+            candidates.append(sorted(chain.from_iterable(matching)))
+    return min(candidates, key=len)
 
-    if property_type:
-        results = [p for p in results if p.get("propertyType") == property_type]
 
-    if measure_type:
-        results = [p for p in results if p.get("propertyMeasureType", "Default") == measure_type]
+def build_word_index(properties: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+    """Map each distinct lowercase name word to the properties containing it.
 
-    return results
+    Args:
+        properties: List of raw properties from API
+
+    Returns:
+        Dict of word -> properties whose name contains that word
+    """
+    index: dict[str, list[dict[str, Any]]] = {}
+    for prop in prepare_properties(properties):
+        for word in set(prop["_name_lower"].split()):
+            index.setdefault(word, []).append(prop)
+    return index
+
+
+def _token_candidates(
+    word_index: dict[str, list[dict[str, Any]]],
+    token_re: re.Pattern[str],
+) -> set[int]:
+    """Ids of properties whose name contains any query token.
+
+    Tokens hold no whitespace, so a token can only occur inside a single
+    name word. Scanning the vocabulary therefore finds exactly the properties
+    a substring scan over every name would.
+    """
+    ids: set[int] = set()
+    for word in filter(token_re.search, word_index):
+        ids.update(map(id, word_index[word]))
+    return ids
+
+
+def _match_score(name_lower: str, query_lower: str, query_tokens: list[str]) -> int | None:
+    """Score exact, substring, and token matches; None if nothing matched."""
+    # Exact match gets highest score
+    if name_lower == query_lower:
+        return 1000
+
+    # Contains full query
+    if query_lower in name_lower:
+        return 500 + (100 - len(name_lower))  # Prefer shorter names
+
+    # Token matching; a token starting a word is also a substring of the name,
+    # so one containment check per token covers word prefixes too
+    token_score = 100 * sum(token in name_lower for token in query_tokens)
+    return token_score or None
 
 
 def search_properties(
     properties: list[dict[str, Any]],
     query: str,
+    word_index: dict[str, list[dict[str, Any]]] | None = None,
 ) -> list[tuple[dict[str, Any], int]]:
     """Search properties by name with scoring.
 
     Args:
         properties: List of raw properties from API
         query: Search query
+        word_index: Optional index from build_word_index covering the
+            properties; narrows exact/token scoring to matching names
 
     Returns:
         List of (property, score) tuples, sorted by score descending
@@ -108,65 +383,85 @@ def search_properties(
     query_lower = _normalize(query)
     query_tokens = query_lower.split()
     scored: list[tuple[dict[str, Any], int]] = []
+    unmatched: list[dict[str, Any]] = []
+
+    # Every exact, substring, or token hit contains at least one query token;
+    # one alternation regex tests all tokens in a single C-level scan
+    token_re = re.compile("|".join(map(re.escape, query_tokens))) if query_tokens else None
+    candidates = (
+        _token_candidates(word_index, token_re)
+        if word_index is not None and token_re is not None
+        else None
+    )
 
-    for prop in properties:
-        name = prop.get("propertyName", "")
-        name_lower = _normalize(name)
-
-        # Exact match gets highest score
-        if name_lower == query_lower:
-            scored.append((prop, 1000))
-            continue
-
-        # Contains full query
-        if query_lower in name_lower:
-            score = 500 + (100 - len(name_lower))  # Prefer shorter names
-            scored.append((prop, score))
-            continue
-
-        # Token matching
-        token_score = 0
-        for token in query_tokens:
-            if token in name_lower:
-                token_score += 100
-            elif any(word.startswith(token) for word in name_lower.split()):
-                token_score += 50
-
-        if token_score > 0:
-            scored.append((prop, token_score))
-            continue
-
-        # Fuzzy matching for typo tolerance (optional, only if rapidfuzz available)
-        try:
-            from rapidfuzz import fuzz
+    for prop in prepare_properties(properties):
+        name_lower = prop["_name_lower"]
 
-            ratio = fuzz.partial_ratio(query_lower, name_lower)
-            if ratio >= 75:
-                scored.append((prop, int(ratio) // 2))
-        except ImportError:
-            pass
+        if candidates is not None:
+            has_token = id(prop) in candidates
+        else:
+            has_token = token_re is None or token_re.search(name_lower) is not None
+
+        if has_token:
+            score = _match_score(name_lower, query_lower, query_tokens)
+            if score is not None:
+                scored.append((prop, score))
+                continue
+
+        unmatched.append(prop)
+
+    # Fuzzy matching for typo tolerance (optional, only if rapidfuzz available)
+    if _fuzz is not None and _fuzz_process is not None and unmatched:
+        # Batch scoring runs in native code; hits are yielded in input order
+        for _, ratio, idx in _fuzz_process.extract_iter(
+            query_lower,
+            [prop["_name_lower"] for prop in unmatched],
+            scorer=_fuzz.partial_ratio,
+            score_cutoff=75,
+        ):
+            scored.append((unmatched[idx], int(ratio) // 2))
 
     # Sort by score descending
-    scored.sort(key=lambda x: -x[1])
+    scored.sort(key=itemgetter(1), reverse=True)
     return scored
 
 
+def build_name_index(properties: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Map each lowercase property name to its first property.
+
+    Args:
+        properties: List of raw properties from API
+
+    Returns:
+        Dict of normalized name -> property
+    """
+    index: dict[str, dict[str, Any]] = {}
+    for prop in prepare_properties(properties):
+        index.setdefault(prop["_name_lower"], prop)
+    return index
+
+
 def exact_lookup(
     properties: list[dict[str, Any]],
     name: str,
+    name_index: dict[str, dict[str, Any]] | None = None,
 ) -> dict[str, Any] | None:
     """Find property by exact name (case-insensitive).
 
     Args:
         properties: List of raw properties from API
         name: Exact property name to find
+        name_index: Optional index from build_name_index covering the
+            properties; turns the scan into a dict lookup
 
     Returns:
         Matching property or None
     """
     name_lower = _normalize(name)
-    for prop in properties:
-        if _normalize(prop.get("propertyName", "")) == name_lower:
+    if name_index is not None:
+        return name_index.get(name_lower)
+    for prop in prepare_properties(properties):
+        if prop["_name_lower"] == name_lower:
             return prop
     return None
 
@@ -180,15 +475,8 @@ def get_groups_summary(properties: list[dict[str, Any]]) -> list[dict[str, Any]]
     Returns:
         List of {name, count} sorted by count descending
     """
-    counts: dict[str, int] = {}
-    for prop in properties:
-        group = prop.get("propertyGroupName", "Other")
-        counts[group] = counts.get(group, 0) + 1
-
-    return sorted(
-        [{"name": name, "count": count} for name, count in counts.items()],
-        key=lambda x: -x["count"],
-    )
+    counts = Counter(prop.get("propertyGroupName", "Other") for prop in properties)
+    return [{"name": name, "count": count} for name, count in counts.most_common()]
 
 
 def get_type_summary(properties: list[dict[str, Any]]) -> dict[str, int]:
@@ -200,11 +488,7 @@ def get_type_summary(properties: list[dict[str, Any]]) -> dict[str, int]:
     Returns:
         Dict of type -> count
     """
-    counts: dict[str, int] = {}
-    for prop in properties:
-        ptype = prop.get("propertyType", "Unknown")
-        counts[ptype] = counts.get(ptype, 0) + 1
-    return counts
+    return dict(Counter(prop.get("propertyType", "Unknown") for prop in properties))
 
 
 def find_similar_groups(
@@ -221,23 +505,25 @@ def find_similar_groups(
         List of similar group names
     """
     query_lower = _normalize(query)
-    groups = {prop.get("propertyGroupName", "") for prop in properties}
+    groups = {
+        prop.get("propertyGroupName", ""): prop["_group_lower"]
+        for prop in prepare_properties(properties)
+    }
 
     suggestions = []
-    for group in groups:
-        group_lower = _normalize(group)
+    for group, group_lower in groups.items():
         if query_lower in group_lower or group_lower.startswith(query_lower[:3]):
             suggestions.append(group)
 
     # Fuzzy match if rapidfuzz available
-    if not suggestions:
-        try:
-            from rapidfuzz import fuzz
-
-            for group in groups:
-                if fuzz.ratio(query_lower, _normalize(group)) >= 70:
-                    suggestions.append(group)
-        except ImportError:
-            pass
+    if not suggestions and _fuzz is not None and _fuzz_process is not None:
+        names = list(groups)
+        for _, _, idx in _fuzz_process.extract_iter(
+            query_lower,
+            [groups[name] for name in names],
+            scorer=_fuzz.ratio,
+            score_cutoff=70,
+        ):
+            suggestions.append(names[idx])
 
     return sorted(suggestions)[:3]
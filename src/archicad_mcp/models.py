@@ -4,6 +4,8 @@ from typing import Any, Literal
 
 from pydantic import BaseModel
 
+ProjectType = Literal["solo", "teamwork", "untitled"]
+
 
 class ArchicadInstance(BaseModel):
     """Information about a running Archicad instance."""
@@ -11,7 +13,7 @@ class ArchicadInstance(BaseModel):
     port: int
     project_name: str
     project_path: str | None
-    project_type: Literal["solo", "teamwork", "untitled"]
+    project_type: ProjectType
     archicad_version: str
     is_tapir_available: bool
 
@@ -4,10 +4,16 @@ from __future__ import annotations
 
 import json
 import logging
+import mmap
+import os
 import re
+import sys
 import tempfile
+from collections.abc import Callable
 from datetime import UTC
+from itertools import islice
 from pathlib import Path
+from types import ModuleType
 from typing import TYPE_CHECKING, Any
 
 from archicad_mcp.schemas.search import SearchIndex
@@ -18,16 +24,96 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write via a sibling temp file and rename, so readers never see a torn file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _matches_file(path: Path, data: bytes) -> bool:
+    """Check whether path already holds exactly data (size first, then bytes)."""
+    try:
+        return path.stat().st_size == len(data) and path.read_bytes() == data
+    except OSError:
+        return False
+
+
+# Fuzzy suggestions are optional; resolved once at import
+_fuzz: ModuleType | None
+_fuzz_process: ModuleType | None
+try:
+    from rapidfuzz import fuzz as _fuzz
+    from rapidfuzz import process as _fuzz_process
+except ImportError:
+    _fuzz = None
+    _fuzz_process = None
+
+# Header of Tapir's generated docs: "var gCommands = " / "var gSchemaDefinitions = "
+_JS_VAR_HEADER = re.compile(rb"var\s+\w+\s*=\s*")
+
+
+def _dumps_pretty_stdlib(obj: Any) -> bytes:
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def _load_json_file_stdlib(path: Path) -> Any:
+    return json.loads(path.read_bytes())
+
+
+# Schema files are parsed with orjson when available; decode errors from
+# both parsers subclass json.JSONDecodeError
+_json_loads: Callable[[bytes | str], Any]
+_json_dumps_pretty: Callable[[Any], bytes]
+_load_json_file: Callable[[Path], Any]
+try:
+    import orjson
+
+    def _dumps_pretty_orjson(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def _load_json_file_orjson(path: Path) -> Any:
+        # orjson parses straight from the mapped pages, so the file is never
+        # copied into a bytes object alongside the parsed tree
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return orjson.loads(b"")  # mmap rejects empty files; raise the decode error
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+
+    _json_loads = orjson.loads
+    _json_dumps_pretty = _dumps_pretty_orjson
+    _load_json_file = _load_json_file_orjson
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps_pretty = _dumps_pretty_stdlib
+    _load_json_file = _load_json_file_stdlib
+
+
 class SchemaCache:
     """Loads and searches command schemas for documentation."""
 
     def __init__(self) -> None:
         self.commands: dict[str, dict[str, Any]] = {}
-        self.categories: list[str] = []
-        self.element_types: list[str] = []
+        self.categories: tuple[str, ...] = ()
+        self.element_types: tuple[str, ...] = ()
         self.common_schemas: dict[str, Any] = {}  # Tapir $ref resolution (#/Name)
         self.builtin_defs: dict[str, Any] = {}  # Built-in $ref resolution (#/$defs/Name)
-        self._search_index: SearchIndex | None = None
+        self._search_index: SearchIndex | None = None  # built on first search()
+        self._resolved: dict[str, dict[str, Any]] = {}  # name -> ref-resolved command
+        self._by_category: dict[str, list[dict[str, Any]]] = {}  # category -> brief listings
+        self._summary: dict[str, Any] = {}
+        self._ref_table: dict[str, Any] = {}  # "$ref" path -> definition
+        self._names: list[str] = []  # command names, parallel to _names_lower
+        self._names_lower: list[str] = []
+        self._categories_lower: list[str] = []  # parallel to categories
+        self._compact_schemas: dict[str, str | None] = {}  # name -> docgen signature
+        self._script_docs: dict[str, str] = {}  # file access docs -> docgen output
+        # api -> [(category, [(name, command), ...])], both levels sorted, for docgen
+        self._doc_plans: dict[str, list[tuple[str, list[tuple[str, dict[str, Any]]]]]] = {}
         self._loaded = False
 
     def load_embedded(self) -> None:
@@ -40,43 +126,31 @@ class SchemaCache:
         # Load Tapir schema
         tapir_path = schema_dir / "tapir.json"
         if tapir_path.exists():
-            with open(tapir_path, encoding="utf-8") as f:
-                data = json.load(f)
-                for name, cmd in data.get("commands", {}).items():
-                    cmd["api"] = "tapir"
-                    cmd["name"] = name
-                    self.commands[name] = cmd
-                # Get element types from Tapir schema
-                self.element_types = data.get("element_types", [])
-                # Load common schemas for $ref resolution
-                self.common_schemas = data.get("common_schemas", {})
+            data = _load_json_file(tapir_path)
+            for name, cmd in data.get("commands", {}).items():
+                cmd["api"] = "tapir"
+                cmd["name"] = name
+                self.commands[name] = cmd
+            # Get element types from Tapir schema
+            self.element_types = tuple(map(sys.intern, data.get("element_types", [])))
+            # Load common schemas for $ref resolution
+            self.common_schemas = data.get("common_schemas", {})
         else:
             logger.warning("Embedded Tapir schemas not found: %s", tapir_path)
 
         # Load Built-in API schema
         builtin_path = schema_dir / "builtin.json"
         if builtin_path.exists():
-            with open(builtin_path, encoding="utf-8") as f:
-                data = json.load(f)
-                for name, cmd in data.get("commands", {}).items():
-                    cmd["api"] = "builtin"
-                    cmd["name"] = name
-                    self.commands[name] = cmd
-                self.builtin_defs = data.get("$defs", {})
+            data = _load_json_file(builtin_path)
+            for name, cmd in data.get("commands", {}).items():
+                cmd["api"] = "builtin"
+                cmd["name"] = name
+                self.commands[name] = cmd
+            self.builtin_defs = data.get("$defs", {})
         else:
             logger.warning("Embedded builtin schemas not found: %s", builtin_path)
 
-        # Build category list
-        self.categories = sorted(
-            {cmd.get("category", "Uncategorized") for cmd in self.commands.values()}
-        )
-
-        # Build search index — pass ref schemas so enum values behind $refs get indexed
-        self._search_index = SearchIndex()
-        ref_schemas = {**self.common_schemas, **self.builtin_defs}
-        self._search_index.build(self.commands, self.element_types, ref_schemas)
-
-        self._loaded = True
+        self._rebuild_index()
 
     def get_command(self, name: str) -> dict[str, Any] | None:
         """Get detailed docs for a specific command.
@@ -86,15 +160,21 @@ class SchemaCache:
 
         Returns:
             Full command schema with parameters, returns, examples, or None if not found.
-            $ref references are resolved to show actual enum values.
+            $ref references are resolved to show actual enum values. The top-level
+            dict is a fresh copy; nested schema objects are shared with the cache
+            and must not be mutated.
         """
         self._ensure_loaded()
-        cmd = self.commands.get(name)
-        if cmd is None:
-            return None
-        # Resolve $refs so AI can see actual enum values
-        resolved: dict[str, Any] = self._resolve_refs(cmd)
-        return resolved
+        resolved = self._resolved.get(name)
+        if resolved is None:
+            cmd = self.commands.get(name)
+            if cmd is None:
+                return None
+            # Resolve $refs so AI can see actual enum values
+            resolved = self._resolve_refs(cmd)
+            self._resolved[name] = resolved
+        # Copied so callers adding or popping keys can't corrupt the memo
+        return dict(resolved)
 
     def get_commands(self, names: list[str]) -> dict[str, Any]:
         """Get detailed docs for multiple commands.
@@ -104,13 +184,13 @@ class SchemaCache:
 
         Returns:
             Dict with 'commands' list and 'not_found' list.
+            $ref references are resolved, as in get_command.
         """
-        self._ensure_loaded()
         found = []
         not_found = []
 
         for name in names:
-            cmd = self.commands.get(name)
+            cmd = self.get_command(name)
             if cmd:
                 found.append(cmd)
             else:
@@ -136,9 +216,7 @@ class SchemaCache:
             Dict with query, total, element_type_hint (if detected), and results.
         """
         self._ensure_loaded()
-        if self._search_index is None:
-            return {"error": "Search index not initialized"}
-        return self._search_index.search(query, limit)
+        return self._ensure_search_index().search(query, limit)
 
     def get_category(self, category: str) -> dict[str, Any]:
         """Get all commands in a category.
@@ -151,26 +229,14 @@ class SchemaCache:
             If category not found, includes suggestion with similar names.
         """
         self._ensure_loaded()
-        matches: list[dict[str, Any]] = []
-
-        for name, cmd in self.commands.items():
-            if cmd.get("category") == category:
-                matches.append(
-                    {
-                        "name": name,
-                        "api": cmd.get("api"),
-                        "description": cmd.get("description"),
-                        "has_details": "parameters" in cmd,
-                    }
-                )
-
-        matches.sort(key=lambda x: str(x["name"]))
+        matches = self._by_category.get(category, [])
 
         result: dict[str, Any] = {
             "query": {"category": category},
             "category": category,
             "total": len(matches),
-            "commands": matches,
+            # Copies of the cached brief listings, which callers may annotate
+            "commands": [dict(brief) for brief in matches],
         }
 
         if not matches:
@@ -189,24 +255,24 @@ class SchemaCache:
         Uses substring match, prefix match, then fuzzy fallback.
         """
         query_lower = query.lower()
-        suggestions: list[str] = []
-
-        for cat in self.categories:
-            cat_lower = cat.lower()
-            if query_lower in cat_lower or cat_lower.startswith(query_lower[:3]):
-                suggestions.append(cat)
-
-        if not suggestions:
-            try:
-                from rapidfuzz import fuzz
+        prefix = query_lower[:3]
+        categories_lower = self._categories_lower
+
+        # Categories are kept sorted, so the first three hits are the answer
+        close = (
+            cat
+            for cat, cat_lower in zip(self.categories, categories_lower, strict=True)
+            if query_lower in cat_lower or cat_lower.startswith(prefix)
+        )
+        suggestions = list(islice(close, 3))
 
-                for cat in self.categories:
-                    if fuzz.ratio(query_lower, cat.lower()) >= 70:
-                        suggestions.append(cat)
-            except ImportError:
-                pass
+        if not suggestions and _fuzz is not None and _fuzz_process is not None:
+            fuzzy = _fuzz_process.extract_iter(
+                query_lower, categories_lower, scorer=_fuzz.ratio, score_cutoff=70
+            )
+            suggestions = [self.categories[idx] for _, _, idx in islice(fuzzy, 3)]
 
-        return sorted(suggestions)[:3]
+        return suggestions
 
     def find_similar_commands(self, query: str, limit: int = 3) -> list[str]:
         """Find command names similar to query using fuzzy matching.
@@ -214,99 +280,112 @@ class SchemaCache:
         Unlike search(), this compares directly against command names
         without tokenization — better for CamelCase command name typos.
         """
-        try:
-            from rapidfuzz import fuzz
-        except ImportError:
+        if _fuzz is None or _fuzz_process is None:
             return []
 
-        query_lower = query.lower()
-        scored: list[tuple[str, float]] = []
-
-        for name in self.commands:
-            ratio = fuzz.ratio(query_lower, name.lower())
-            if ratio >= 40:
-                scored.append((name, ratio))
-
-        scored.sort(key=lambda x: -x[1])
-        return [name for name, _ in scored[:limit]]
+        # One native call scores every name and keeps the top `limit`
+        matches = _fuzz_process.extract(
+            query.lower(),
+            self._names_lower,
+            scorer=_fuzz.ratio,
+            score_cutoff=40,
+            limit=limit,
+        )
+        return [self._names[idx] for _, _, idx in matches]
 
     def get_summary(self) -> dict[str, Any]:
         """Get overview of all available commands.
 
         Returns:
             Dict with total count, categories with counts, and element types.
+            A fresh copy each call (element types are an immutable tuple).
         """
         self._ensure_loaded()
-
-        # Count commands per category
-        category_counts: dict[str, int] = {}
-        for cmd in self.commands.values():
-            cat = cmd.get("category", "Uncategorized")
-            category_counts[cat] = category_counts.get(cat, 0) + 1
-
-        # Count by API
-        tapir_count = sum(1 for c in self.commands.values() if c.get("api") == "tapir")
-        builtin_count = sum(1 for c in self.commands.values() if c.get("api") == "builtin")
-
-        return {
-            "total_commands": len(self.commands),
-            "tapir_commands": tapir_count,
-            "builtin_commands": builtin_count,
-            "categories": category_counts,
-            "element_types": self.element_types,
-            "tip": "Use get_docs(category='...') to browse commands in a category",
-        }
+        summary = dict(self._summary)
+        summary["categories"] = dict(summary["categories"])
+        return summary
 
     def _ensure_loaded(self) -> None:
         """Ensure schemas are loaded."""
         if not self._loaded:
             self.load_embedded()
 
-    def _resolve_refs(self, obj: Any, depth: int = 0) -> Any:
+    def _ensure_search_index(self) -> SearchIndex:
+        """Build the search index on first use; reloads reset it."""
+        if self._search_index is None:
+            # Pass ref schemas so enum values behind $refs get indexed
+            index = SearchIndex()
+            ref_schemas = {**self.common_schemas, **self.builtin_defs}
+            index.build(self.commands, self.element_types, ref_schemas)
+            self._search_index = index
+        return self._search_index
+
+    def _resolve_refs(
+        self,
+        obj: Any,
+        depth: int = 0,
+        memo: dict[tuple[str, int], Any] | None = None,
+    ) -> Any:
         """Recursively resolve $ref references in schema objects.
 
+        Copy-on-write: containers are only rebuilt when something beneath
+        them was resolved, so ref-free subtrees are returned as-is.
+
         Args:
             obj: Schema object (dict, list, or primitive)
             depth: Current recursion depth (limited to prevent infinite loops)
+            memo: Refs already resolved during this walk, keyed by ref path and
+                depth (the depth limit can truncate a ref reached deeper down)
 
         Returns:
             Object with $refs resolved to their definitions.
         """
         if depth > 10:  # Prevent infinite recursion
             return obj
+        if memo is None:
+            memo = {}
 
         if isinstance(obj, dict):
             # Check if this contains a $ref
             if "$ref" in obj:
                 ref_path = obj["$ref"]
-                resolved_schema = None
-
-                if ref_path.startswith("#/$defs/"):
-                    # Built-in API format: #/$defs/Name
-                    ref_name = ref_path[8:]  # Strip "#/$defs/"
-                    if ref_name in self.builtin_defs:
-                        resolved_schema = self.builtin_defs[ref_name].copy()
-                elif ref_path.startswith("#/"):
-                    # Tapir format: #/Name
-                    ref_name = ref_path[2:]  # Strip "#/"
-                    if ref_name in self.common_schemas:
-                        resolved_schema = self.common_schemas[ref_name].copy()
-
+                resolved_schema = self._ref_table.get(ref_path)
                 if resolved_schema is not None:
+                    key = (ref_path, depth)
+                    if key in memo:
+                        resolved = memo[key]
+                    else:
+                        resolved = self._resolve_refs(resolved_schema, depth + 1, memo)
+                        memo[key] = resolved
                     # Merge sibling fields (e.g. description) with resolved schema
                     siblings = {k: v for k, v in obj.items() if k != "$ref"}
-                    resolved = self._resolve_refs(resolved_schema, depth + 1)
                     if siblings:
                         resolved = {**resolved, **siblings}
                     return resolved
                 # Return original if can't resolve
                 return obj
 
-            # Recurse into dict values
-            return {k: self._resolve_refs(v, depth + 1) for k, v in obj.items()}
+            # Recurse into dict values, rebuilding only if a value changed
+            changed: dict[str, Any] | None = None
+            for k, v in obj.items():
+                if isinstance(v, (dict, list)):
+                    new_v = self._resolve_refs(v, depth + 1, memo)
+                    if new_v is not v:
+                        if changed is None:
+                            changed = {}
+                        changed[k] = new_v
+            return obj if changed is None else {**obj, **changed}
 
         if isinstance(obj, list):
-            return [self._resolve_refs(item, depth + 1) for item in obj]
+            items: list[Any] | None = None
+            for i, item in enumerate(obj):
+                if isinstance(item, (dict, list)):
+                    new_item = self._resolve_refs(item, depth + 1, memo)
+                    if new_item is not item:
+                        if items is None:
+                            items = list(obj)
+                        items[i] = new_item
+            return obj if items is None else items
 
         return obj
 
@@ -344,10 +423,10 @@ class SchemaCache:
                     return False
 
                 # Parse JS files (format: "var gCommands = [...];" or "var gSchemaDefinitions = {...};")
-                commands_data = self._parse_js_var(commands_file.read_text(encoding="utf-8"))
+                commands_data = self._parse_js_var(commands_file.read_bytes())
                 common_schemas = {}
                 if schemas_file.exists():
-                    common_schemas = self._parse_js_var(schemas_file.read_text(encoding="utf-8"))
+                    common_schemas = self._parse_js_var(schemas_file.read_bytes())
 
                 if not commands_data:
                     logger.warning("Failed to parse command_definitions.js")
@@ -375,16 +454,17 @@ class SchemaCache:
             logger.warning(f"Failed to load schemas from Tapir: {e}")
             return False
 
-    def _parse_js_var(self, content: str) -> Any:
+    def _parse_js_var(self, content: bytes) -> Any:
         """Parse JavaScript variable assignment to extract JSON value."""
         # Match: var gCommands = [...]; or var gSchemaDefinitions = {...};
-        match = re.search(r"var\s+\w+\s*=\s*(.+);?\s*$", content, re.DOTALL)
+        # Only the header is matched; the payload is sliced off after it
+        match = _JS_VAR_HEADER.search(content)
         if not match:
             return None
 
-        json_str = match.group(1).rstrip(";").strip()
+        payload = content[match.end() :].rstrip().rstrip(b";")
         try:
-            return json.loads(json_str)
+            return _json_loads(payload)
         except json.JSONDecodeError:
             return None
 
@@ -399,23 +479,24 @@ class SchemaCache:
         for group in commands_data:
             category = group.get("name", "Uncategorized")
             for cmd in group.get("commands", []):
-                name = cmd.get("name")
+                cmd_get = cmd.get
+                name = cmd_get("name")
                 if not name:
                     continue
 
                 converted: dict[str, Any] = {
                     "category": category,
-                    "description": cmd.get("description", ""),
-                    "version": cmd.get("version", ""),
+                    "description": cmd_get("description", ""),
+                    "version": cmd_get("version", ""),
                 }
 
                 # Add input schema if present
-                if cmd.get("inputScheme"):
-                    converted["parameters"] = cmd["inputScheme"]
+                if input_scheme := cmd_get("inputScheme"):
+                    converted["parameters"] = input_scheme
 
                 # Add output schema if present
-                if cmd.get("outputScheme"):
-                    converted["returns"] = cmd["outputScheme"]
+                if output_scheme := cmd_get("outputScheme"):
+                    converted["returns"] = output_scheme
 
                 result[name] = converted
 
@@ -442,8 +523,11 @@ class SchemaCache:
                 "_generated": "auto-generated from Tapir GenerateDocumentation",
             }
 
-            with open(cache_path, "w", encoding="utf-8") as f:
-                json.dump(cache_data, f, indent=2)
+            data = _json_dumps_pretty(cache_data)
+            if _matches_file(cache_path, data):
+                logger.info(f"Tapir schema cache unchanged: {cache_path}")
+                return
+            _write_atomic(cache_path, data)
 
             logger.info(f"Saved Tapir schema cache to {cache_path}")
         except Exception as e:
@@ -451,16 +535,69 @@ class SchemaCache:
 
     def _rebuild_index(self) -> None:
         """Rebuild search index after loading new schemas."""
-        # Rebuild category list
-        self.categories = sorted(
-            {cmd.get("category", "Uncategorized") for cmd in self.commands.values()}
-        )
+        # Count commands per category and API in one pass
+        category_counts: dict[str, int] = {}
+        api_counts: dict[str, int] = {}
+        for cmd in self.commands.values():
+            cat = cmd.get("category")
+            if cat is None:
+                cat = "Uncategorized"
+            else:
+                # Dozens of distinct categories shared by hundreds of commands
+                cat = cmd["category"] = sys.intern(cat)
+            category_counts[cat] = category_counts.get(cat, 0) + 1
+            api = cmd.get("api", "")
+            api_counts[api] = api_counts.get(api, 0) + 1
+
+        # Rebuild category list; lowercased names serve typo suggestions
+        self.categories = tuple(sorted(category_counts))
+        self._categories_lower = [cat.lower() for cat in self.categories]
+        self._names = list(self.commands)
+        self._names_lower = [name.lower() for name in self._names]
 
-        # Rebuild search index — pass ref schemas so enum values behind $refs get indexed
-        self._search_index = SearchIndex()
-        ref_schemas = {**self.common_schemas, **self.builtin_defs}
-        self._search_index.build(self.commands, self.element_types, ref_schemas)
+        self._summary = {
+            "total_commands": len(self.commands),
+            "tapir_commands": api_counts.get("tapir", 0),
+            "builtin_commands": api_counts.get("builtin", 0),
+            "categories": category_counts,
+            "element_types": self.element_types,
+            "tip": "Use get_docs(category='...') to browse commands in a category",
+        }
+
+        # Brief listings per category, sorted by name, served by get_category;
+        # docgen's per-API category plans are grouped in the same pass
+        by_category: dict[str, list[dict[str, Any]]] = {}
+        doc_groups: dict[str, dict[str, list[tuple[str, dict[str, Any]]]]] = {}
+        commands = self.commands
+        for name in sorted(commands):
+            cmd = commands[name]
+            cmd_get = cmd.get
+            api = cmd_get("api")
+            by_category.setdefault(cmd_get("category", ""), []).append(
+                {
+                    "name": name,
+                    "api": api,
+                    "description": cmd_get("description"),
+                    "has_details": "parameters" in cmd,
+                }
+            )
+            doc_groups.setdefault(api or "", {}).setdefault(
+                cmd_get("category", "Uncategorized"), []
+            ).append((name, cmd))
+        self._by_category = by_category
+        self._doc_plans = {api: sorted(groups.items()) for api, groups in doc_groups.items()}
+
+        # Full $ref path -> definition: Tapir "#/Name", built-in "#/$defs/Name"
+        self._ref_table = {f"#/{name}": schema for name, schema in self.common_schemas.items()}
+        self._ref_table.update(
+            (f"#/$defs/{name}", schema) for name, schema in self.builtin_defs.items()
+        )
 
+        # Search index is rebuilt lazily on the next search()
+        self._search_index = None
+        self._resolved.clear()
+        self._compact_schemas.clear()
+        self._script_docs.clear()
         self._loaded = True
 
     def sync_from_repo(self, repo_path: Path) -> bool:
@@ -502,14 +639,14 @@ class SchemaCache:
             logger.error(f"Not found: {commands_file}")
             return False
 
-        commands_data = self._parse_js_var(commands_file.read_text(encoding="utf-8"))
+        commands_data = self._parse_js_var(commands_file.read_bytes())
         if not commands_data:
             logger.error("Failed to parse command_definitions.js")
             return False
 
         common_schemas: dict[str, Any] = {}
         if schemas_file.exists():
-            common_schemas = self._parse_js_var(schemas_file.read_text(encoding="utf-8")) or {}
+            common_schemas = self._parse_js_var(schemas_file.read_bytes()) or {}
 
         tapir_commands = self._convert_tapir_docs(commands_data, common_schemas)
 
@@ -542,15 +679,13 @@ class SchemaCache:
             logger.error(f"Not found: {details_file}")
             return False
 
-        with open(details_file, encoding="utf-8") as f:
-            details: list[dict[str, Any]] = json.load(f)
+        details: list[dict[str, Any]] = _load_json_file(details_file)
 
         # Load master schema for full parameter/return definitions
         master_defs: dict[str, Any] = {}
         if master_file.exists():
-            with open(master_file, encoding="utf-8") as f:
-                master = json.load(f)
-                master_defs = master.get("$defs", {})
+            master = _load_json_file(master_file)
+            master_defs = master.get("$defs", {})
         else:
             logger.warning(
                 f"Master schema not found: {master_file} (proceeding without full schemas)"
@@ -558,13 +693,14 @@ class SchemaCache:
 
         commands: dict[str, dict[str, Any]] = {}
         for entry in details:
-            name = entry.get("name", "")
+            entry_get = entry.get
+            name = entry_get("name", "")
             if not name:
                 continue
 
             cmd: dict[str, Any] = {
-                "category": entry.get("group", "Uncategorized"),
-                "description": entry.get("description", ""),
+                "category": entry_get("group", "Uncategorized"),
+                "description": entry_get("description", ""),
             }
 
             # Map API.Foo -> FooParameters / FooResult in $defs
@@ -616,8 +752,11 @@ class SchemaCache:
             if shared_defs:
                 cache_data["$defs"] = shared_defs
 
-            with open(cache_path, "w", encoding="utf-8") as f:
-                json.dump(cache_data, f, indent=2)
+            data = _json_dumps_pretty(cache_data)
+            if _matches_file(cache_path, data):
+                logger.info(f"builtin schema cache unchanged: {cache_path}")
+                return
+            _write_atomic(cache_path, data)
 
             logger.info(f"Saved builtin schema cache to {cache_path}")
         except Exception as e:
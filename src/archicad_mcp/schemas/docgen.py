@@ -28,11 +28,15 @@ REF_RESOLUTIONS = {
     "#/ClassificationId": "{classificationSystemId, classificationItemId}",
 }
 
+# Compact names of schema types that render without looking further
+_LEAF_TYPES = {"number": "num", "integer": "int", "boolean": "bool"}
+
 
 def _schema_to_compact(
     schema: dict[str, Any],
     common_schemas: dict[str, Any] | None = None,
     depth: int = 0,
+    ref_memo: dict[tuple[str, int], str] | None = None,
 ) -> str:
     """Convert a JSON schema to compact representation.
 
@@ -42,6 +46,8 @@ def _schema_to_compact(
             When provided, unresolved $refs are expanded from these definitions
             automatically, so no manual REF_RESOLUTIONS entry is needed.
         depth: Current nesting depth (to limit recursion)
+        ref_memo: Expanded $refs keyed by (name, depth); only valid for the
+            common_schemas it was filled from
 
     Returns:
         Compact string representation like "{x, y, z}" or "[{elementId}]"
@@ -53,21 +59,29 @@ def _schema_to_compact(
     if "$ref" in schema:
         ref: str = schema["$ref"]
         # 1) Explicit overrides for common patterns
-        if ref in REF_RESOLUTIONS:
-            return REF_RESOLUTIONS[ref]
+        if (override := REF_RESOLUTIONS.get(ref)) is not None:
+            return override
+        # Bare type name of "#/Name" (Tapir) or "#/$defs/Name" (built-in API)
+        ref_name = ref.removeprefix("#/").removeprefix("$defs/")
         # 2) Auto-resolve from common_schemas (zero maintenance)
-        if common_schemas:
-            ref_name = ref.lstrip("#/")
-            # Handle #/$defs/Name format (built-in API)
-            if ref_name.startswith("$defs/"):
-                ref_name = ref_name[6:]
-            if ref_name in common_schemas:
+        if common_schemas and ref_name in common_schemas:
+            if ref_memo is None:
                 return _schema_to_compact(common_schemas[ref_name], common_schemas, depth)
+            key = (ref_name, depth)
+            if key not in ref_memo:
+                ref_memo[key] = _schema_to_compact(
+                    common_schemas[ref_name], common_schemas, depth, ref_memo
+                )
+            return ref_memo[key]
         # 3) Fallback: bare type name
-        return ref.replace("#/$defs/", "").replace("#/", "")
+        return ref_name
 
     schema_type = schema.get("type")
 
+    # Primitive leaves, the bulk of any schema tree, in one lookup
+    if isinstance(schema_type, str) and (leaf := _LEAF_TYPES.get(schema_type)) is not None:
+        return leaf
+
     if schema_type == "object":
         props = schema.get("properties", {})
         if not props:
@@ -76,14 +90,14 @@ def _schema_to_compact(
         parts = []
 
         for name, prop_schema in props.items():
-            prop_value = _schema_to_compact(prop_schema, common_schemas, depth + 1)
+            prop_value = _schema_to_compact(prop_schema, common_schemas, depth + 1, ref_memo)
             parts.append(f"{name}: {prop_value}" if prop_value != "..." else name)
 
         return "{" + ", ".join(parts) + "}"
 
     elif schema_type == "array":
         items = schema.get("items", {})
-        item_compact = _schema_to_compact(items, common_schemas, depth + 1)
+        item_compact = _schema_to_compact(items, common_schemas, depth + 1, ref_memo)
         return f"[{item_compact}]"
 
     elif schema_type == "string":
@@ -92,20 +106,11 @@ def _schema_to_compact(
             return "|".join(f'"{v}"' for v in schema["enum"][:3])
         return "str"
 
-    elif schema_type == "number":
-        return "num"
-
-    elif schema_type == "integer":
-        return "int"
-
-    elif schema_type == "boolean":
-        return "bool"
-
     # oneOf/anyOf - just take first option
     elif "oneOf" in schema or "anyOf" in schema:
         options = schema.get("oneOf") or schema.get("anyOf", [])
         if options:
-            return _schema_to_compact(options[0], common_schemas, depth + 1)
+            return _schema_to_compact(options[0], common_schemas, depth + 1, ref_memo)
 
     return "any"
 
@@ -114,6 +119,7 @@ def generate_compact_schema(
     cmd_name: str,
     cmd_data: dict[str, Any],
     common_schemas: dict[str, Any] | None = None,
+    ref_memo: dict[tuple[str, int], str] | None = None,
 ) -> str | None:
     """Generate compact schema representation for a command.
 
@@ -121,6 +127,8 @@ def generate_compact_schema(
         cmd_name: Command name (e.g., "CreateColumns")
         cmd_data: Command schema data
         common_schemas: Tapir common schema definitions for $ref resolution.
+        ref_memo: Optional memo of expanded $refs, shared across commands
+            that use the same common_schemas
 
     Returns:
         Compact representation string, or None if generation fails.
@@ -136,7 +144,7 @@ def generate_compact_schema(
             props = params_schema["properties"]
             param_parts = []
             for pname, pschema in props.items():
-                pcompact = _schema_to_compact(pschema, common_schemas)
+                pcompact = _schema_to_compact(pschema, common_schemas, 0, ref_memo)
                 param_parts.append(f"{pname}: {pcompact}")
             params_str = ", ".join(param_parts)
         else:
@@ -145,7 +153,9 @@ def generate_compact_schema(
         # Build return signature
         returns_schema = cmd_data.get("returns", {})
         returns_str = (
-            _schema_to_compact(returns_schema, common_schemas) if returns_schema else "void"
+            _schema_to_compact(returns_schema, common_schemas, 0, ref_memo)
+            if returns_schema
+            else "void"
         )
 
         # Get description (truncate if too long)
@@ -166,6 +176,22 @@ def generate_compact_schema(
         return None
 
 
+def _cached_compact_schema(
+    schemas: SchemaCache,
+    cmd_name: str,
+    cmd_data: dict[str, Any],
+    common_schemas: dict[str, Any],
+    ref_memo: dict[tuple[str, int], str],
+) -> str | None:
+    """Compact schema for a loaded command, memoized until the schemas reload."""
+    memo = schemas._compact_schemas
+    if cmd_name in memo:
+        return memo[cmd_name]
+    compact = generate_compact_schema(cmd_name, cmd_data, common_schemas, ref_memo)
+    memo[cmd_name] = compact
+    return compact
+
+
 def _get_element_types(schemas: SchemaCache) -> list[str]:
     """Extract element types from schema data."""
     return list(schemas.common_schemas.get("ElementType", {}).get("enum", []))
@@ -203,7 +229,12 @@ def generate_execute_script_docs(
 
     Returns:
         Complete docstring for execute_script tool.
+        Cached on the SchemaCache until its schemas reload.
     """
+    cached = schemas._script_docs.get(file_access_docs)
+    if cached is not None:
+        return cached
+
     lines = [
         "Execute Python script with full Archicad API access.",
         "",
@@ -219,20 +250,15 @@ def generate_execute_script_docs(
         "",
     ]
 
-    # Group tapir commands by category
-    by_category: dict[str, list[tuple[str, dict[str, Any]]]] = {}
-    for cmd_name, cmd_data in schemas.commands.items():
-        if cmd_data.get("api") != "tapir":
-            continue
-        cat = cmd_data.get("category", "Uncategorized")
-        by_category.setdefault(cat, []).append((cmd_name, cmd_data))
-
-    # Sort categories, then commands within each
+    # Tapir commands by category, both sorted when the schemas were indexed
     generated = 0
-    for cat in sorted(by_category):
-        cmds = sorted(by_category[cat], key=lambda x: x[0])
+    # $ref expansions repeat across commands; shared per set of definitions
+    tapir_refs: dict[tuple[str, int], str] = {}
+    for _cat, cmds in schemas._doc_plans.get("tapir", []):
         for cmd_name, cmd_data in cmds:
-            compact = generate_compact_schema(cmd_name, cmd_data, schemas.common_schemas)
+            compact = _cached_compact_schema(
+                schemas, cmd_name, cmd_data, schemas.common_schemas, tapir_refs
+            )
             if compact:
                 lines.append(compact)
                 lines.append("")
@@ -240,15 +266,9 @@ def generate_execute_script_docs(
 
     logger.info(f"Generated docs for {generated} Tapir commands")
 
-    # Group built-in API commands by category
-    builtin_by_category: dict[str, list[tuple[str, dict[str, Any]]]] = {}
-    for cmd_name, cmd_data in schemas.commands.items():
-        if cmd_data.get("api") != "builtin":
-            continue
-        cat = cmd_data.get("category", "Uncategorized")
-        builtin_by_category.setdefault(cat, []).append((cmd_name, cmd_data))
-
-    if builtin_by_category:
+    # Built-in API commands by category, sorted likewise
+    builtin_plan = schemas._doc_plans.get("builtin", [])
+    if builtin_plan:
         lines.extend(
             [
                 "BUILT-IN API COMMANDS",
@@ -258,10 +278,12 @@ def generate_execute_script_docs(
             ]
         )
         builtin_generated = 0
-        for cat in sorted(builtin_by_category):
-            cmds = sorted(builtin_by_category[cat], key=lambda x: x[0])
+        builtin_refs: dict[tuple[str, int], str] = {}
+        for _cat, cmds in builtin_plan:
             for cmd_name, cmd_data in cmds:
-                compact = generate_compact_schema(cmd_name, cmd_data, schemas.builtin_defs)
+                compact = _cached_compact_schema(
+                    schemas, cmd_name, cmd_data, schemas.builtin_defs, builtin_refs
+                )
                 if compact:
                     lines.append(compact)
                     lines.append("")
@@ -333,4 +355,6 @@ def generate_execute_script_docs(
         ]
     )
 
-    return "\n".join(lines)
+    docs = "\n".join(lines)
+    schemas._script_docs[file_access_docs] = docs
+    return docs
@@ -2,9 +2,24 @@
 
 from __future__ import annotations
 
-import json
 import re
-from typing import Any
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from collections.abc import Iterator, Sequence
+from types import ModuleType
+from typing import Any, ClassVar
+
+# Fuzzy matching is optional; resolved once at import
+_fuzz: ModuleType | None
+_fuzz_process: ModuleType | None
+try:
+    from rapidfuzz import fuzz as _fuzz
+    from rapidfuzz import process as _fuzz_process
+except ImportError:
+    _fuzz = None
+    _fuzz_process = None
+
+_TOKEN_RE = re.compile(r"[a-z0-9]{2,}")
 
 
 def tokenize(text: str) -> list[str]:
@@ -16,10 +31,27 @@ def tokenize(text: str) -> list[str]:
     Returns:
         List of lowercase tokens (min 2 chars)
     """
-    text = text.lower()
-    # Split on non-alphanumeric, keep tokens >= 2 chars
-    tokens = re.split(r"[^a-z0-9]+", text)
-    return [t for t in tokens if len(t) >= 2]
+    # Alphanumeric runs of >= 2 chars, found in one pass
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _iter_text(obj: Any) -> Iterator[str]:
+    """Yield the keys and scalar values of a JSON value in document order.
+
+    Covers the same text a JSON dump would, without serializing it; booleans
+    and nulls are skipped, as they carry no searchable content.
+    """
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            yield key
+            yield from _iter_text(value)
+    elif isinstance(obj, list):
+        for item in obj:
+            yield from _iter_text(item)
+    elif isinstance(obj, (int, float)) and not isinstance(obj, bool):
+        yield str(obj)
 
 
 class SearchIndex:
@@ -39,6 +71,11 @@ class SearchIndex:
     WEIGHT_EXAMPLE = 15
     WEIGHT_RETURNS = 10
 
+    # Indexed fields in sorted order; field i is tracked as bit 1 << i, so
+    # decoding a mask low bit first yields sorted field names
+    FIELDS = ("description", "enum", "example", "name", "notes", "parameters", "returns")
+    FIELD_BITS: ClassVar[dict[str, int]] = {field: 1 << i for i, field in enumerate(FIELDS)}
+
     # JSON Schema keywords to skip during indexing (not semantic content)
     SCHEMA_KEYWORDS = frozenset(
         {
@@ -72,23 +109,32 @@ class SearchIndex:
         self.element_types_lower: dict[str, str] = {}  # lowercase -> actual
         self.ref_schemas: dict[str, Any] = {}  # $ref target name -> schema
 
-        # Inverted index: token -> [(command_name, field, weight)]
-        self.token_index: dict[str, list[tuple[str, str, int]]] = {}
+        # Inverted index: token -> [(command_name, field_bit, weight, count)], one
+        # posting per distinct occurrence; count repeats it within the field
+        self.token_index: dict[str, list[tuple[str, int, int, int]]] = {}
+        # Occurrence counts collected while building, keyed like the postings
+        self._occurrences: dict[str, dict[tuple[str, int, int], int]] = {}
 
         # All unique tokens (for fuzzy matching)
         self.all_tokens: set[str] = set()
+        # The same tokens sorted, so prefix matches form a contiguous run
+        self.sorted_tokens: list[str] = []
+        # Fuzzy matching candidates: tokens of 4+ chars ordered by length,
+        # with their lengths alongside for bisecting a length window
+        self.fuzzy_tokens: list[str] = []
+        self.fuzzy_token_lens: list[int] = []
 
     def build(
         self,
         commands: dict[str, dict[str, Any]],
-        element_types: list[str],
+        element_types: Sequence[str],
         ref_schemas: dict[str, Any] | None = None,
     ) -> None:
         """Build search index from loaded schemas.
 
         Args:
             commands: Dict of command_name -> command_schema
-            element_types: List of valid element types
+            element_types: Valid element types
             ref_schemas: Dict of schema name -> schema definition for $ref lookup
         """
         self.commands = commands
@@ -97,98 +143,119 @@ class SearchIndex:
         self.ref_schemas = ref_schemas or {}
 
         # Clear and rebuild index
-        self.token_index = {}
-        self.all_tokens = set()
-
+        self._occurrences = {}
         for name, cmd in commands.items():
             self._index_command(name, cmd)
 
+        self.token_index = {
+            token: [(*posting, count) for posting, count in postings.items()]
+            for token, postings in self._occurrences.items()
+        }
+        self._occurrences = {}
+        self.all_tokens = set(self.token_index)
+        self.sorted_tokens = sorted(self.all_tokens)
+        self.fuzzy_tokens = sorted((t for t in self.sorted_tokens if len(t) >= 4), key=len)
+        self.fuzzy_token_lens = [len(t) for t in self.fuzzy_tokens]
+
     def _add_to_index(self, token: str, command: str, field: str, weight: int) -> None:
-        """Add a token to the inverted index."""
-        if token not in self.token_index:
-            self.token_index[token] = []
-        self.token_index[token].append((command, field, weight))
-        self.all_tokens.add(token)
+        """Count a token occurrence for the inverted index."""
+        postings = self._occurrences.get(token)
+        if postings is None:
+            postings = self._occurrences[token] = {}
+        key = (command, self.FIELD_BITS[field], weight)
+        postings[key] = postings.get(key, 0) + 1
 
     def _index_command(self, name: str, cmd: dict[str, Any]) -> None:
         """Index all searchable text from a command."""
+        add = self._add_to_index
+        cmd_get = cmd.get
+
         # Index command name
         for token in tokenize(name):
-            self._add_to_index(token, name, "name", self.WEIGHT_NAME)
+            add(token, name, "name", self.WEIGHT_NAME)
 
         # Index description
-        desc = cmd.get("description", "")
+        desc = cmd_get("description", "")
         for token in tokenize(desc):
-            self._add_to_index(token, name, "description", self.WEIGHT_DESCRIPTION)
+            add(token, name, "description", self.WEIGHT_DESCRIPTION)
 
         # Index parameters
-        params = cmd.get("parameters", {})
+        params = cmd_get("parameters", {})
         self._index_parameters(name, params)
 
         # Index example
-        example = cmd.get("example")
+        example = cmd_get("example")
         if example:
-            example_text = json.dumps(example) if isinstance(example, dict) else str(example)
-            for token in tokenize(example_text):
-                self._add_to_index(token, name, "example", self.WEIGHT_EXAMPLE)
+            for text in _iter_text(example):
+                for token in tokenize(text):
+                    add(token, name, "example", self.WEIGHT_EXAMPLE)
 
         # Index notes
-        notes = cmd.get("notes", "")
+        notes = cmd_get("notes", "")
         for token in tokenize(notes):
-            self._add_to_index(token, name, "notes", self.WEIGHT_NOTES)
+            add(token, name, "notes", self.WEIGHT_NOTES)
 
         # Index returns
-        returns = cmd.get("returns", {})
+        returns = cmd_get("returns", {})
         if returns:
-            returns_text = json.dumps(returns) if isinstance(returns, dict) else str(returns)
-            for token in tokenize(returns_text):
-                self._add_to_index(token, name, "returns", self.WEIGHT_RETURNS)
+            for text in _iter_text(returns):
+                for token in tokenize(text):
+                    add(token, name, "returns", self.WEIGHT_RETURNS)
 
     def _index_parameters(self, name: str, params: Any, depth: int = 0) -> None:
         """Recursively index parameter names and descriptions."""
         if depth > 5:  # Prevent infinite recursion
             return
 
-        if isinstance(params, dict):
-            for param_name, param_value in params.items():
-                # Skip JSON schema keywords - they're not semantic content
-                if param_name in self.SCHEMA_KEYWORDS:
-                    # Index enum values — they contain domain vocabulary
-                    if param_name == "enum" and isinstance(param_value, list):
-                        for item in param_value:
-                            if isinstance(item, str):
+        # Schemas come straight from JSON, so exact type checks suffice
+        if type(params) is not dict:
+            return
+
+        add = self._add_to_index
+        recurse = self._index_parameters
+        skip = self.SCHEMA_KEYWORDS
+        weight_enum = self.WEIGHT_ENUM
+
+        for param_name, param_value in params.items():
+            value_type = type(param_value)
+            # Skip JSON schema keywords - they're not semantic content
+            if param_name in skip:
+                # Index enum values — they contain domain vocabulary
+                if param_name == "enum" and value_type is list:
+                    for item in param_value:
+                        if type(item) is str:
+                            for token in tokenize(item):
+                                add(token, name, "enum", weight_enum)
+                # Look up $ref targets and index their enum values
+                elif param_name == "$ref" and value_type is str:
+                    ref_name = param_value.rsplit("/", 1)[-1]
+                    ref_schema = self.ref_schemas.get(ref_name)
+                    if type(ref_schema) is dict:
+                        enum_values = ref_schema.get("enum", [])
+                        for item in enum_values:
+                            if type(item) is str:
                                 for token in tokenize(item):
-                                    self._add_to_index(token, name, "enum", self.WEIGHT_ENUM)
-                    # Look up $ref targets and index their enum values
-                    elif param_name == "$ref" and isinstance(param_value, str):
-                        ref_name = param_value.rsplit("/", 1)[-1]
-                        ref_schema = self.ref_schemas.get(ref_name)
-                        if isinstance(ref_schema, dict):
-                            enum_values = ref_schema.get("enum", [])
-                            for item in enum_values:
-                                if isinstance(item, str):
-                                    for token in tokenize(item):
-                                        self._add_to_index(token, name, "enum", self.WEIGHT_ENUM)
-                    # Still recurse into nested structures
-                    if isinstance(param_value, dict):
-                        self._index_parameters(name, param_value, depth + 1)
-                    elif isinstance(param_value, list):
-                        for item in param_value:
-                            if isinstance(item, dict):
-                                self._index_parameters(name, item, depth + 1)
-                    continue
-
-                # Index parameter name
-                for token in tokenize(param_name):
-                    self._add_to_index(token, name, "parameters", self.WEIGHT_PARAM_NAME)
-
-                # Index parameter description/type if string
-                if isinstance(param_value, str):
-                    for token in tokenize(param_value):
-                        self._add_to_index(token, name, "parameters", self.WEIGHT_PARAM_DESC)
-                elif isinstance(param_value, dict):
-                    # Recurse into nested parameter definitions
-                    self._index_parameters(name, param_value, depth + 1)
+                                    add(token, name, "enum", weight_enum)
+                # Still recurse into nested structures
+                if value_type is dict:
+                    recurse(name, param_value, depth + 1)
+                elif value_type is list:
+                    for item in param_value:
+                        if type(item) is dict:
+                            recurse(name, item, depth + 1)
+                continue
+
+            # Index parameter name
+            for token in tokenize(param_name):
+                add(token, name, "parameters", self.WEIGHT_PARAM_NAME)
+
+            # Index parameter description/type if string
+            if value_type is str:
+                for token in tokenize(param_value):
+                    add(token, name, "parameters", self.WEIGHT_PARAM_DESC)
+            elif value_type is dict:
+                # Recurse into nested parameter definitions
+                recurse(name, param_value, depth + 1)
 
     def search(self, query: str, limit: int = 20) -> dict[str, Any]:
         """Search for commands matching query.
@@ -200,8 +267,8 @@ class SearchIndex:
         Returns:
             Dict with query, total, element_type_hint (if detected), and results
         """
-        query_lower = query.lower().strip()
-        tokens = tokenize(query_lower)
+        # tokenize lowercases and drops surrounding whitespace itself
+        tokens = tokenize(query)
 
         if not tokens:
             return {
@@ -218,23 +285,24 @@ class SearchIndex:
         scores = self._score_exact_and_prefix(tokens)
 
         # If no good results, try fuzzy matching
-        if not scores or max(s for s, _, _ in scores.values()) < 20:
-            fuzzy_scores = self._score_fuzzy(tokens)
+        if not scores or max(row[0] for row in scores.values()) < 20:
             # Merge fuzzy scores
-            for cmd, (score, fields, qtokens) in fuzzy_scores.items():
-                if cmd in scores:
-                    es, ef, eq = scores[cmd]
-                    scores[cmd] = (es + score, ef | fields, eq | qtokens)
+            for cmd, fuzzy_row in self._score_fuzzy(tokens).items():
+                row = scores.get(cmd)
+                if row is None:
+                    scores[cmd] = fuzzy_row
                 else:
-                    scores[cmd] = (score, fields, qtokens)
+                    row[0] += fuzzy_row[0]
+                    row[1] |= fuzzy_row[1]
+                    row[2] |= fuzzy_row[2]
 
         # Apply coverage multiplier for multi-token queries:
         # commands matching all query tokens keep full score,
         # partial matches are scaled down proportionally.
         if len(tokens) > 1:
-            for cmd_name, (score, fields, qtokens) in scores.items():
-                coverage = len(qtokens) / len(tokens)
-                scores[cmd_name] = (int(score * coverage), fields, qtokens)
+            for row in scores.values():
+                coverage = row[2].bit_count() / len(tokens)
+                row[0] = int(row[0] * coverage)
 
         # Build results
         results = self._build_results(scores, limit)
@@ -276,95 +344,100 @@ class SearchIndex:
                 }
         return None
 
-    def _score_exact_and_prefix(
-        self, tokens: list[str]
-    ) -> dict[str, tuple[int, set[str], set[str]]]:
+    @staticmethod
+    def _query_token_bits(tokens: list[str]) -> dict[str, int]:
+        """Assign one bit per distinct query token."""
+        bits: dict[str, int] = {}
+        for token in tokens:
+            if token not in bits:
+                bits[token] = 1 << len(bits)
+        return bits
+
+    def _score_exact_and_prefix(self, tokens: list[str]) -> dict[str, list[int]]:
         """Score commands by exact and prefix token matches.
 
         Returns:
-            Dict of command_name -> (score, matched fields, matched query tokens)
+            Dict of command_name -> [score, matched field bits, matched query token bits]
         """
-        scores: dict[str, tuple[int, set[str], set[str]]] = {}
+        scores: defaultdict[str, list[int]] = defaultdict(lambda: [0, 0, 0])
+        token_index = self.token_index
+        sorted_tokens = self.sorted_tokens
 
+        # Repeated query tokens score once per occurrence but share one coverage bit
+        bits = self._query_token_bits(tokens)
         for token in tokens:
+            token_bit = bits[token]
             # Exact matches
-            if token in self.token_index:
-                for cmd_name, field, weight in self.token_index[token]:
-                    if cmd_name not in scores:
-                        scores[cmd_name] = (0, set(), set())
-                    score, fields, qtokens = scores[cmd_name]
-                    scores[cmd_name] = (
-                        score + weight,
-                        fields | {field},
-                        qtokens | {token},
-                    )
-
-            # Prefix matches (tokens >= 3 chars)
+            if token in token_index:
+                for cmd_name, field_bit, weight, count in token_index[token]:
+                    row = scores[cmd_name]
+                    row[0] += weight * count
+                    row[1] |= field_bit
+                    row[2] |= token_bit
+
+            # Prefix matches (tokens >= 3 chars): longer tokens sharing the
+            # prefix sort directly after the token itself
             if len(token) >= 3:
-                for indexed_token in self.all_tokens:
-                    if indexed_token.startswith(token) and indexed_token != token:
-                        for cmd_name, field, weight in self.token_index[indexed_token]:
-                            if cmd_name not in scores:
-                                scores[cmd_name] = (0, set(), set())
-                            score, fields, qtokens = scores[cmd_name]
-                            # Prefix match gets 50% weight
-                            scores[cmd_name] = (
-                                score + weight // 2,
-                                fields | {field},
-                                qtokens | {token},
-                            )
+                for i in range(bisect_right(sorted_tokens, token), len(sorted_tokens)):
+                    indexed_token = sorted_tokens[i]
+                    if not indexed_token.startswith(token):
+                        break
+                    for cmd_name, field_bit, weight, count in token_index[indexed_token]:
+                        row = scores[cmd_name]
+                        # Prefix match gets 50% weight
+                        row[0] += weight // 2 * count
+                        row[1] |= field_bit
+                        row[2] |= token_bit
 
         return scores
 
-    def _score_fuzzy(self, tokens: list[str]) -> dict[str, tuple[int, set[str], set[str]]]:
+    def _score_fuzzy(self, tokens: list[str]) -> dict[str, list[int]]:
         """Score commands using fuzzy matching for typo tolerance.
 
         Returns:
-            Dict of command_name -> (score, matched fields, matched query tokens)
+            Dict of command_name -> [score, matched field bits, matched query token bits]
         """
-        try:
-            from rapidfuzz import fuzz
-        except ImportError:
+        if _fuzz is None or _fuzz_process is None:
             return {}
 
-        scores: dict[str, tuple[int, set[str], set[str]]] = {}
+        scores: defaultdict[str, list[int]] = defaultdict(lambda: [0, 0, 0])
+        token_index = self.token_index
 
+        bits = self._query_token_bits(tokens)
         for token in tokens:
+            token_bit = bits[token]
             if len(token) < 4:
                 continue
 
-            # Find similar tokens
-            for indexed_token in self.all_tokens:
-                if len(indexed_token) < 4:
-                    continue
-
-                # Use partial ratio for better substring matching
-                ratio = fuzz.ratio(token, indexed_token)
-                if ratio >= 80:  # 80% similarity threshold
-                    for cmd_name, field, weight in self.token_index[indexed_token]:
-                        if cmd_name not in scores:
-                            scores[cmd_name] = (0, set(), set())
-                        score, fields, qtokens = scores[cmd_name]
-                        # Fuzzy match gets 30% weight, scaled by ratio
-                        fuzzy_weight = int(weight * 30 * ratio) // (100 * 100)
-                        scores[cmd_name] = (
-                            score + fuzzy_weight,
-                            fields | {field},
-                            qtokens | {token},
-                        )
+            # ratio <= 200 * shorter / (len_a + len_b), so reaching 80 needs the
+            # candidate length within [2/3, 3/2] of the query token's
+            size = len(token)
+            lo = bisect_left(self.fuzzy_token_lens, -(-2 * size // 3))
+            hi = bisect_right(self.fuzzy_token_lens, 3 * size // 2)
+
+            # Find similar tokens: one native pass per query token, 80% threshold
+            similar = _fuzz_process.extract_iter(
+                token, self.fuzzy_tokens[lo:hi], scorer=_fuzz.ratio, score_cutoff=80
+            )
+            for indexed_token, ratio, _ in similar:
+                for cmd_name, field_bit, weight, count in token_index[indexed_token]:
+                    row = scores[cmd_name]
+                    # Fuzzy match gets 30% weight, scaled by ratio
+                    row[0] += int(weight * 30 * ratio) // (100 * 100) * count
+                    row[1] |= field_bit
+                    row[2] |= token_bit
 
         return scores
 
-    def _build_results(
-        self, scores: dict[str, tuple[int, set[str], set[str]]], limit: int
-    ) -> list[dict[str, Any]]:
+    def _build_results(self, scores: dict[str, list[int]], limit: int) -> list[dict[str, Any]]:
         """Build sorted result list from scores."""
         results = []
 
         # Sort by score descending
         sorted_cmds = sorted(scores.items(), key=lambda x: -x[1][0])
 
-        for cmd_name, (score, fields, _qtokens) in sorted_cmds[:limit]:
+        fields = self.FIELDS
+        for cmd_name, (score, field_mask, _token_mask) in sorted_cmds[:limit]:
             cmd = self.commands.get(cmd_name, {})
             results.append(
                 {
@@ -372,7 +445,7 @@ class SearchIndex:
                     "description": cmd.get("description", ""),
                     "category": cmd.get("category", ""),
                     "score": score,
-                    "matched_in": sorted(fields),
+                    "matched_in": [f for i, f in enumerate(fields) if field_mask >> i & 1],
                     "has_details": "parameters" in cmd,
                 }
             )
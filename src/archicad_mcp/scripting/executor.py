@@ -17,7 +17,6 @@ import pathlib
 import re
 import statistics
 import time
-import traceback
 import types
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
@@ -56,6 +55,8 @@ ALLOWED_MODULES: dict[str, Any] = {
 _IMPORTABLE_MODULES = frozenset(
     name for name, obj in ALLOWED_MODULES.items() if isinstance(obj, types.ModuleType)
 )
+# Listed in the error raised for rejected imports
+_IMPORTABLE_MODULES_STR = ", ".join(sorted(_IMPORTABLE_MODULES))
 
 
 def _safe_import(
@@ -67,8 +68,7 @@ def _safe_import(
 ) -> Any:
     """Restricted __import__ that only allows ALLOWED_MODULES."""
     if name not in _IMPORTABLE_MODULES:
-        allowed = ", ".join(sorted(_IMPORTABLE_MODULES))
-        raise ImportError(f"Module '{name}' is not available. Available: {allowed}")
+        raise ImportError(f"Module '{name}' is not available. Available: {_IMPORTABLE_MODULES_STR}")
     return builtins.__import__(name, globals, locals, fromlist, level)
 
 
@@ -154,7 +154,7 @@ def _is_write_mode(mode: str) -> bool:
     Returns:
         True if mode allows writing.
     """
-    return bool(set(mode) & WRITE_MODE_CHARS)
+    return not WRITE_MODE_CHARS.isdisjoint(mode)
 
 
 def _create_safe_open(config: SecurityConfig) -> Callable[..., Any]:
@@ -166,6 +166,11 @@ def _create_safe_open(config: SecurityConfig) -> Callable[..., Any]:
     Returns:
         A wrapped open() function that checks paths before opening.
     """
+    # The config is frozen, so snapshot what each open() call needs
+    is_path_blocked = config.is_path_blocked
+    sandboxed = config.mode == "sandboxed"
+    allowed_str = ", ".join(config.allowed_write_expanded)
+    blocked_str = ", ".join(config.blocked_expanded)
 
     def safe_open(
         file: str | Path,
@@ -181,15 +186,14 @@ def _create_safe_open(config: SecurityConfig) -> Callable[..., Any]:
         path_str = str(file)
         is_write = _is_write_mode(mode)
 
-        if config.is_path_blocked(path_str, for_write=is_write):
-            if is_write and config.mode == "sandboxed":
+        if is_path_blocked(path_str, for_write=is_write):
+            if is_write and sandboxed:
                 raise PermissionError(
                     f"Write access denied: '{path_str}' is not in allowed write paths. "
-                    f"Allowed: {', '.join(config.allowed_write_expanded)}"
+                    f"Allowed: {allowed_str}"
                 )
             raise PermissionError(
-                f"Access denied: '{path_str}' is in a blocked directory. "
-                f"Blocked: {', '.join(config.blocked_expanded)}"
+                f"Access denied: '{path_str}' is in a blocked directory. Blocked: {blocked_str}"
             )
 
         return open(file, mode, *args, **kwargs)
@@ -197,6 +201,31 @@ def _create_safe_open(config: SecurityConfig) -> Callable[..., Any]:
     return safe_open
 
 
+# Fixed wrapper around the indented user script. The prefix spans three lines,
+# which _format_error subtracts to map tracebacks back to script lines.
+_WRAP_PREFIX = "\nasync def __script_main__():\n    result = None\n"
+_WRAP_SUFFIX = "\n    globals()['result'] = result\n\n__script_result__ = __script_main__()\n"
+
+
+@functools.lru_cache(maxsize=256)
+def _wrap_script_cached(script: str) -> str:
+    """Wrap script in async function to support await."""
+    # Indent all lines
+    indented = "\n".join("    " + line if line.strip() else line for line in script.split("\n"))
+
+    return _WRAP_PREFIX + indented + _WRAP_SUFFIX
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_cached(wrapped_source: str) -> types.CodeType:
+    """Compile a wrapped script, reusing the code object for repeated scripts.
+
+    Code objects are immutable, so one can be exec'd into any number of
+    namespaces. SyntaxError propagates and is not cached.
+    """
+    return compile(wrapped_source, "<script>", "exec")
+
+
 class ScriptExecutor:
     """Executes Python scripts with Archicad API access."""
 
@@ -232,10 +261,10 @@ class ScriptExecutor:
 
         try:
             # Wrap script in async function to support await
-            wrapped_script = self._wrap_script(script)
+            wrapped_script = _wrap_script_cached(script)
 
-            # Compile
-            code = compile(wrapped_script, "<script>", "exec")
+            # Compile (cached for repeated scripts)
+            code = _compile_cached(wrapped_script)
 
             # Execute the wrapper to define __script_main__
             exec(code, namespace)
@@ -300,18 +329,19 @@ class ScriptExecutor:
         # Create safe_open with path restrictions for BOTH modes
         safe_open = _create_safe_open(config)
 
-        namespace: dict[str, Any] = {
-            # Core objects
-            "archicad": api,
-            "port": port,
-            "result": None,
-            # Captured print
-            "print": lambda *args, **kwargs: builtins.print(*args, file=stdout_capture, **kwargs),
-            # File access (path-restricted in both modes)
-            "open": safe_open,
-            # Allowed modules
-            **ALLOWED_MODULES,
-        }
+        # Allowed modules (copying the constant dict beats re-merging it per run)
+        namespace = ALLOWED_MODULES.copy()
+        # Core objects
+        namespace["archicad"] = api
+        namespace["port"] = port
+        namespace["result"] = None
+        # Captured print. A lambda rather than functools.partial: partial would let a
+        # script's own file= (even file=None, i.e. the server's stdio channel) win.
+        namespace["print"] = lambda *args, **kwargs: builtins.print(
+            *args, file=stdout_capture, **kwargs
+        )
+        # File access (path-restricted in both modes)
+        namespace["open"] = safe_open
 
         if config.mode == "unrestricted":
             # Full builtins (but open is still path-restricted)
@@ -322,52 +352,42 @@ class ScriptExecutor:
 
         return namespace
 
-    def _wrap_script(self, script: str) -> str:
-        """Wrap script in async function to support await."""
-        # Indent all lines
-        indented = "\n".join("    " + line if line.strip() else line for line in script.split("\n"))
-
-        return f"""
-async def __script_main__():
-    result = None
-{indented}
-    globals()['result'] = result
-
-__script_result__ = __script_main__()
-"""
-
     def _process_result(self, result: Any) -> Any:
-        """Process result, truncating large lists."""
-        if isinstance(result, list) and len(result) > MAX_RESULT_ITEMS:
-            return {
-                "total": len(result),
-                "sample": result[:SAMPLE_SIZE],
-                "truncated": True,
-                "warning": f"Result list has {len(result)} items. "
-                f"Showing first {SAMPLE_SIZE}. Process data in script to return smaller results.",
-            }
+        """Process result, truncating large lists and tuples."""
+        if isinstance(result, (list, tuple)):
+            n = len(result)
+            if n > MAX_RESULT_ITEMS:
+                return {
+                    "total": n,
+                    "sample": list(result[:SAMPLE_SIZE]),
+                    "truncated": True,
+                    "warning": f"Result list has {n} items. Showing first {SAMPLE_SIZE}. "
+                    "Process data in script to return smaller results.",
+                }
         return result
 
     def _format_error(self, exc: Exception, script: str) -> str:
         """Format exception with line number from original script."""
-        tb = traceback.extract_tb(exc.__traceback__)
-
-        # Find the frame in our script
+        # Find the innermost frame in our script. Walking the traceback directly
+        # avoids extract_tb's FrameSummary objects and source lookups.
         script_line: int | None = None
-        for frame in reversed(tb):
-            if frame.filename == "<script>" and frame.lineno is not None:
+        tb = exc.__traceback__
+        while tb is not None:
+            if tb.tb_frame.f_code.co_filename == "<script>" and tb.tb_lineno is not None:
                 # Adjust for wrapper: subtract 3 lines (async def, result=None, blank)
-                script_line = frame.lineno - 3
-                break
+                script_line = tb.tb_lineno - 3
+            tb = tb.tb_next
 
         error_type = type(exc).__name__
         error_msg = str(exc)
 
         if script_line and script_line > 0:
-            # Get the offending line
-            lines = script.split("\n")
-            if 0 < script_line <= len(lines):
-                offending_line = lines[script_line - 1].strip()
+            # Get the offending line without splitting the whole script
+            if script_line <= script.count("\n") + 1:
+                lines = io.StringIO(script)
+                offending_line = next(
+                    itertools.islice(lines, script_line - 1, script_line), ""
+                ).strip()
                 return f"Line {script_line}: {error_type}: {error_msg}\n  > {offending_line}"
             return f"Line {script_line}: {error_type}: {error_msg}"
 
@@ -1,22 +1,20 @@
 """FastMCP server for Archicad automation."""
 
+import asyncio
 import logging
 from collections.abc import AsyncIterator, Callable
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from typing import Any, TypeAlias, TypeVar, cast
 
-import aiohttp
 from mcp.server.fastmcp import Context, FastMCP
 
 from archicad_mcp.config import format_file_access_docs, load_config
 from archicad_mcp.core import ArchicadError, ConnectionManager, PropertyCache
+from archicad_mcp.core.manager import create_session
 from archicad_mcp.core.properties import (
     _format_property,
     exact_lookup,
     filter_properties,
-    find_similar_groups,
-    get_groups_summary,
-    get_type_summary,
     search_properties,
 )
 from archicad_mcp.models import ArchicadInstance, ScriptResult
@@ -48,13 +46,7 @@ security_config = load_config()
 async def lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
     """Initialize and cleanup shared resources."""
     # Create shared HTTP session with connection pooling
-    session = aiohttp.ClientSession(
-        timeout=aiohttp.ClientTimeout(total=300),
-        connector=aiohttp.TCPConnector(
-            keepalive_timeout=60,
-            limit=20,  # Max concurrent connections
-        ),
-    )
+    session = create_session()
 
     # Initialize managers
     manager = ConnectionManager(session)
@@ -71,6 +63,15 @@ async def lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
         if conn._tapir_available is True and await schemas.load_from_tapir(conn):
             break  # Successfully loaded live schemas
 
+    # Warm the property cache for every Tapir-enabled instance in parallel, in the
+    # background so a slow instance can't stall startup. get_properties fetches
+    # any port the prefetch hasn't finished yet.
+    prefetch_task = asyncio.create_task(
+        property_cache.prefetch(
+            [conn for conn in manager.connections.values() if conn._tapir_available is True]
+        )
+    )
+
     # Generate dynamic execute_script docstring from loaded schemas
     file_access_docs = format_file_access_docs(security_config)
     execute_script_description = generate_execute_script_docs(schemas, file_access_docs)
@@ -86,20 +87,24 @@ async def lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
         mgr: ConnectionManager = ctx.request_context.lifespan_context["manager"]
         exe: ScriptExecutor = ctx.request_context.lifespan_context["executor"]
         cfg = ctx.request_context.lifespan_context["security_config"]
-        conn = mgr.get(port)
+        conn = await mgr.get_or_connect(port)
         return await exe.run(script, conn, timeout_seconds, cfg)
 
-    yield {
-        "session": session,
-        "manager": manager,
-        "executor": executor,
-        "schemas": schemas,
-        "security_config": security_config,
-        "property_cache": property_cache,
-    }
-
-    # Shutdown
-    await session.close()
+    try:
+        yield {
+            "session": session,
+            "manager": manager,
+            "executor": executor,
+            "schemas": schemas,
+            "security_config": security_config,
+            "property_cache": property_cache,
+        }
+    finally:
+        # Shutdown
+        prefetch_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await prefetch_task
+        await session.close()
 
 
 mcp = FastMCP(
@@ -255,7 +260,7 @@ async def get_properties(
     """
     manager: ConnectionManager = ctx.request_context.lifespan_context["manager"]
     cache: PropertyCache = ctx.request_context.lifespan_context["property_cache"]
-    conn = manager.get(port)
+    conn = await manager.get_or_connect(port)
 
     # Clamp limit
     limit = max(1, min(limit, 200))
@@ -268,7 +273,7 @@ async def get_properties(
 
     # Mode 1: Exact lookup by property name
     if property:
-        match = exact_lookup(all_props, property)
+        match = exact_lookup(all_props, property, cache.get_name_index(conn.port))
         if match:
             formatted = _format_property(match)
             return {
@@ -284,7 +289,7 @@ async def get_properties(
                 },
             }
         # Not found - suggest similar
-        similar = find_similar_groups(all_props, property)
+        similar = cache.get_similar_groups(conn.port, property)
         return {
             "query": {"property": property},
             "found": False,
@@ -297,8 +302,8 @@ async def get_properties(
     if not has_filter:
         return {
             "total_properties": len(all_props),
-            "groups": get_groups_summary(all_props),
-            "property_types": get_type_summary(all_props),
+            "groups": cache.get_groups_summary(conn.port),
+            "property_types": cache.get_type_summary(conn.port),
             "tip": "Use search, group, or measure_type to filter properties",
         }
 
@@ -308,11 +313,12 @@ async def get_properties(
         group=group,
         property_type=property_type,
         measure_type=measure_type,
+        buckets=cache.get_buckets(conn.port),
     )
 
     # Check if group filter matched nothing
     if group and not filtered:
-        similar = find_similar_groups(all_props, group)
+        similar = cache.get_similar_groups(conn.port, group)
         suggestion = (
             f"Did you mean: {similar}?" if similar else "Use get_properties() to see all groups."
         )
@@ -325,7 +331,7 @@ async def get_properties(
 
     # Apply search if provided
     if search:
-        scored = search_properties(filtered, search)
+        scored = search_properties(filtered, search, cache.get_word_index(conn.port))
         results = [p for p, _ in scored[:limit]]
         total = len(scored)
     else:
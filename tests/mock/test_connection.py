@@ -1,10 +1,16 @@
 """Mock tests for ArchicadConnection."""
 
+import json
+from collections.abc import Callable, Iterator
+from typing import Any
+from unittest.mock import patch
+
 import aiohttp
 import pytest
 from aioresponses import aioresponses
 
-from archicad_mcp.core.connection import ArchicadConnection
+from archicad_mcp.core import connection as connection_module
+from archicad_mcp.core.connection import ArchicadConnection, tapir_payload
 from archicad_mcp.core.errors import (
     ArchicadConnectionError,
     CommandError,
@@ -34,6 +40,42 @@ def connection(session: aiohttp.ClientSession) -> ArchicadConnection:
     )
 
 
+JsonBackend = tuple[Callable[[Any], bytes], Callable[[bytes], Any]]
+
+
+@pytest.fixture(params=["stdlib", "orjson"])
+def json_backend(request: pytest.FixtureRequest) -> Iterator[JsonBackend]:
+    """Patch the connection's JSON helpers to one backend."""
+    if request.param == "stdlib":
+        backend: JsonBackend = (connection_module._dumps_stdlib, json.loads)
+    else:
+        pytest.importorskip("orjson")
+        backend = (connection_module._dumps_orjson, connection_module._loads_orjson)
+    with (
+        patch.object(connection_module, "_json_dumps", backend[0]),
+        patch.object(connection_module, "_json_loads", backend[1]),
+    ):
+        yield backend
+
+
+class TestTapirPayload:
+    """Tests for the Tapir request envelope."""
+
+    def test_wraps_command_and_parameters(self) -> None:
+        """Payload routes through API.ExecuteAddOnCommand in the Tapir namespace."""
+        payload = tapir_payload("GetProjectInfo", {"a": 1})
+        assert payload == {
+            "command": "API.ExecuteAddOnCommand",
+            "parameters": {
+                "addOnCommandId": {
+                    "commandNamespace": "TapirCommand",
+                    "commandName": "GetProjectInfo",
+                },
+                "addOnCommandParameters": {"a": 1},
+            },
+        }
+
+
 class TestArchicadConnectionInit:
     """Tests for connection initialization."""
 
@@ -49,6 +91,24 @@ class TestArchicadConnectionInit:
         assert connection.version == "27.0.0"
         assert connection.is_teamwork is False
 
+    def test_project_type(self, session: aiohttp.ClientSession) -> None:
+        """Project type is derived once from teamwork flag and project name."""
+        solo = ArchicadConnection(19723, session, {"projectName": "House"})
+        teamwork = ArchicadConnection(19723, session, {"isTeamwork": True})
+        untitled = ArchicadConnection(19723, session, {"projectName": "Untitled"})
+        assert solo.project_type == "solo"
+        assert teamwork.project_type == "teamwork"
+        assert untitled.project_type == "untitled"
+
+    def test_instance_snapshot_reused(self, connection: ArchicadConnection) -> None:
+        """to_instance() reuses its snapshot until Tapir availability changes."""
+        first = connection.to_instance()
+        assert connection.to_instance() is first
+        connection._tapir_available = True
+        updated = connection.to_instance()
+        assert updated is not first
+        assert updated.is_tapir_available is True
+
     def test_tapir_available_initially_unknown(self, connection: ArchicadConnection) -> None:
         """Tapir availability is unknown until first use."""
         assert connection._tapir_available is None
@@ -264,3 +324,65 @@ class TestCommandRouting:
             result = await connection.execute("GetProjectInfo", {})
             assert result["projectName"] == "Test"
             assert connection._tapir_available is True
+
+
+class TestJsonBackends:
+    """Both JSON backends encode and decode like the standard library."""
+
+    def test_encodes_non_string_keys_and_big_ints(self, json_backend: JsonBackend) -> None:
+        """Integer keys and integers beyond 64 bits are encoded, not rejected."""
+        dumps, _ = json_backend
+        assert json.loads(dumps({1: "a", "n": 2**70})) == {"1": "a", "n": 2**70}
+
+    def test_encodes_nan_like_stdlib(self, json_backend: JsonBackend) -> None:
+        """NaN is written as NaN, not silently turned into null."""
+        dumps, _ = json_backend
+        assert dumps({"x": float("nan"), "y": None}) == b'{"x":NaN,"y":null}'
+
+    def test_decodes_nan_literal(self, json_backend: JsonBackend) -> None:
+        """NaN literals in responses still parse."""
+        _, loads = json_backend
+        assert loads(b'{"a": [1, "b"], "x": NaN}')["a"] == [1, "b"]
+
+    async def test_unserializable_parameters_raise_command_error(
+        self, connection: ArchicadConnection, json_backend: JsonBackend
+    ) -> None:
+        """Parameters that cannot be encoded surface as CommandError."""
+        with pytest.raises(CommandError) as exc_info:
+            await connection.execute("API.GetAllElements", {"bad": object()})
+
+        assert exc_info.value.details["command"] == "API.GetAllElements"
+
+    async def test_invalid_json_response_raises_command_error(
+        self, connection: ArchicadConnection, json_backend: JsonBackend
+    ) -> None:
+        """A malformed response body surfaces as CommandError."""
+        with aioresponses() as m:
+            m.post("http://127.0.0.1:19723", body="<html>not json</html>")
+
+            with pytest.raises(CommandError, match="invalid JSON"):
+                await connection.execute("GetProjectInfo", {})
+
+    async def test_round_trip_command(
+        self, connection: ArchicadConnection, json_backend: JsonBackend
+    ) -> None:
+        """A normal command round-trips through the patched backend."""
+        with aioresponses() as m:
+            m.post(
+                "http://127.0.0.1:19723",
+                payload={"succeeded": True, "result": {"elements": [{"guid": "abc"}]}},
+            )
+
+            result = await connection.execute("API.GetAllElements", {"filter": None})
+
+            assert result == {"elements": [{"guid": "abc"}]}
+
+
+class TestOrjsonFastPath:
+    """The orjson encoder is used as-is when it cannot differ from the stdlib."""
+
+    def test_null_free_payload_uses_orjson_output(self) -> None:
+        """Payloads without null keep orjson's bytes."""
+        orjson = pytest.importorskip("orjson")
+        payload = {"command": "API.GetAllElements", "parameters": {"n": 1.5, "ok": True}}
+        assert connection_module._dumps_orjson(payload) == orjson.dumps(payload)
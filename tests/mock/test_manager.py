@@ -1,11 +1,14 @@
 """Mock tests for ConnectionManager."""
 
+import asyncio
+from unittest.mock import patch
+
 import aiohttp
 import pytest
-from aioresponses import aioresponses
+from aioresponses import CallbackResult, aioresponses
 
 from archicad_mcp.core.errors import ArchicadConnectionError
-from archicad_mcp.core.manager import PORT_RANGE, ConnectionManager
+from archicad_mcp.core.manager import PORT_RANGE, ConnectionManager, create_session
 
 
 @pytest.fixture
@@ -29,6 +32,19 @@ class TestConnectionManagerInit:
         assert manager.connections == {}
 
 
+class TestCreateSession:
+    """Tests for the shared session factory."""
+
+    async def test_pool_fits_full_scan(self) -> None:
+        """Connection pool is large enough to probe every port at once."""
+        session = create_session()
+        try:
+            assert session.connector is not None
+            assert session.connector.limit >= len(PORT_RANGE)
+        finally:
+            await session.close()
+
+
 class TestPortScanning:
     """Tests for port scanning."""
 
@@ -86,6 +102,33 @@ class TestPortScanning:
 
             assert manager.connections == {}
 
+    async def test_no_tapir_request_to_unconfirmed_ports(self, manager: ConnectionManager) -> None:
+        """Ports whose product probe fails never receive a Tapir request."""
+
+        async def slow_reject(url: object, **kwargs: object) -> CallbackResult:
+            # Yield so a concurrently started project request would get sent
+            await asyncio.sleep(0.01)
+            return CallbackResult(status=500)
+
+        with aioresponses() as m:
+            m.post("http://127.0.0.1:19723", callback=slow_reject, repeat=True)
+            m.post("http://127.0.0.1:19724", payload={"succeeded": False})
+            for port in PORT_RANGE:
+                if port not in (19723, 19724):
+                    m.post(
+                        f"http://127.0.0.1:{port}",
+                        exception=aiohttp.ClientError("Connection refused"),
+                    )
+
+            await manager.scan_and_connect()
+
+            commands = [
+                call.kwargs["json"]["command"] for calls in m.requests.values() for call in calls
+            ]
+            assert manager.connections == {}
+            assert len(commands) == len(PORT_RANGE)
+            assert set(commands) == {"API.GetProductInfo"}
+
     async def test_handles_tapir_not_installed(self, manager: ConnectionManager) -> None:
         """Scanner works even when Tapir is not installed."""
         with aioresponses() as m:
@@ -189,6 +232,41 @@ class TestGetConnection:
 
             assert conn.port == 19723
 
+    async def test_get_or_connect_probes_only_target(self, manager: ConnectionManager) -> None:
+        """get_or_connect() connects an unknown port without scanning the others."""
+        with aioresponses() as m:
+            m.post(
+                "http://127.0.0.1:19725",
+                payload={"succeeded": True, "result": {"version": "27.0.0"}},
+            )
+            m.post(
+                "http://127.0.0.1:19725",
+                payload={
+                    "succeeded": True,
+                    "result": {"addOnCommandResponse": {"projectName": "Late"}},
+                },
+            )
+
+            conn = await manager.get_or_connect(19725)
+
+            assert conn.project_name == "Late"
+            assert list(manager.connections) == [19725]
+
+    async def test_get_or_connect_raises_when_not_running(self, manager: ConnectionManager) -> None:
+        """get_or_connect() raises like get() when the port has no instance."""
+        with aioresponses() as m:
+            m.post(
+                "http://127.0.0.1:19725",
+                exception=aiohttp.ClientError("Connection refused"),
+            )
+            m.post(
+                "http://127.0.0.1:19725",
+                exception=aiohttp.ClientError("Connection refused"),
+            )
+
+            with pytest.raises(ArchicadConnectionError):
+                await manager.get_or_connect(19725)
+
     def test_get_nonexistent_raises(self, manager: ConnectionManager) -> None:
         """get() raises ArchicadConnectionError for unknown port."""
         with pytest.raises(ArchicadConnectionError) as exc_info:
@@ -249,7 +327,7 @@ class TestRefresh:
     """Tests for refresh functionality."""
 
     async def test_refresh_rescans_ports(self, manager: ConnectionManager) -> None:
-        """refresh() rescans all ports."""
+        """refresh() rescans dead ports once their backoff has expired."""
         with aioresponses() as m:
             # First scan - no instances
             for port in PORT_RANGE:
@@ -280,5 +358,21 @@ class TestRefresh:
                         exception=aiohttp.ClientError("Connection refused"),
                     )
 
-            await manager.refresh()
+            with patch("archicad_mcp.core.manager.time.monotonic", return_value=1e9):
+                await manager.refresh()
             assert len(manager.connections) == 1
+
+    async def test_refresh_skips_recently_dead_ports(self, manager: ConnectionManager) -> None:
+        """refresh() does not re-probe ports that just failed."""
+        with aioresponses() as m:
+            for port in PORT_RANGE:
+                m.post(
+                    f"http://127.0.0.1:{port}",
+                    exception=aiohttp.ClientError("Connection refused"),
+                )
+
+            await manager.scan_and_connect()
+            probed = sum(len(calls) for calls in m.requests.values())
+
+            await manager.refresh()
+            assert sum(len(calls) for calls in m.requests.values()) == probed
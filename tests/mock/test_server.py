@@ -0,0 +1,51 @@
+"""Mock tests for the server lifespan."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+pytest.importorskip("mcp.server.fastmcp")
+
+from archicad_mcp.server import lifespan
+
+
+class TestLifespan:
+    """Tests for startup and shutdown of shared resources."""
+
+    async def test_slow_property_prefetch_does_not_block_startup(self) -> None:
+        """Startup yields before the prefetch finishes and cancels it on shutdown."""
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def slow_execute(command: str, params: dict[str, object]) -> dict[str, object]:
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return {"properties": []}
+
+        conn = MagicMock(port=19723, _tapir_available=True)
+        conn.execute = slow_execute
+        manager = MagicMock(connections={19723: conn})
+        manager.scan_and_connect = AsyncMock()
+        schemas = MagicMock()
+        schemas.load_from_tapir = AsyncMock(return_value=False)
+        session = MagicMock()
+        session.close = AsyncMock()
+
+        with (
+            patch("archicad_mcp.server.create_session", return_value=session),
+            patch("archicad_mcp.server.ConnectionManager", return_value=manager),
+            patch("archicad_mcp.server.SchemaCache", return_value=schemas),
+            patch("archicad_mcp.server.generate_execute_script_docs", return_value="docs"),
+        ):
+            async with asyncio.timeout(1), lifespan(MagicMock()) as context:
+                # Startup returned while GetAllProperties is still in flight
+                await started.wait()
+                assert context["property_cache"].get_word_index(19723) is None
+
+        assert cancelled.is_set()
+        session.close.assert_awaited_once()
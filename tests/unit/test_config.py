@@ -2,20 +2,25 @@
 
 from __future__ import annotations
 
+import dataclasses
 import os
 import sys
 import tempfile
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
+
 from archicad_mcp.config import (
     SecurityConfig,
+    compile_pattern,
     expand_pattern,
     format_file_access_docs,
     get_default_blocked,
     load_config,
     matches_pattern,
     normalize_for_match,
+    split_patterns,
 )
 
 
@@ -119,6 +124,24 @@ class TestNormalizeForMatch:
         else:
             assert result.startswith("/")
 
+    def test_relative_path_follows_cwd(self, tmp_path: Path) -> None:
+        """Memoized relative paths still resolve against the current directory."""
+        first = normalize_for_match("out.txt")
+        cwd = os.getcwd()
+        try:
+            os.chdir(tmp_path)
+            second = normalize_for_match("out.txt")
+        finally:
+            os.chdir(cwd)
+        assert first != second
+        assert second.endswith("/out.txt")
+
+    def test_windows_match_form_lowercases(self) -> None:
+        """Windows variant lowercases and converts backslashes."""
+        from archicad_mcp.config import _match_form_windows
+
+        assert _match_form_windows(r"C:\Users\TEST") == "c:/users/test"
+
     @patch("archicad_mcp.config.sys.platform", "win32")
     def test_lowercase_on_windows(self) -> None:
         """Lowercases paths on Windows."""
@@ -167,6 +190,50 @@ class TestMatchesPattern:
         )
 
 
+class TestCompilePattern:
+    """Tests for compile_pattern()."""
+
+    def test_reuses_compiled_regex(self) -> None:
+        """Same pattern returns the same compiled regex."""
+        assert compile_pattern("~/Desktop/*") is compile_pattern("~/Desktop/*")
+
+    def test_matches_normalized_path(self) -> None:
+        """Compiled regex matches normalized paths like matches_pattern()."""
+        home = str(Path.home()).replace("\\", "/")
+        regex = compile_pattern("~/Desktop/*")
+        assert regex.match(normalize_for_match(f"{home}/Desktop/file.txt"))
+        assert not regex.match(normalize_for_match(f"{home}/Downloads/file.txt"))
+
+
+class TestSplitPatterns:
+    """Tests for split_patterns()."""
+
+    def test_directory_wildcard_becomes_prefix(self) -> None:
+        """Patterns ending in /* with a literal head become prefixes."""
+        prefixes, regex = split_patterns(["/usr/*"])
+        assert prefixes == (normalize_for_match("/usr/*")[:-1],)
+        assert not regex.match(normalize_for_match("/usr/bin"))
+
+    def test_double_star_becomes_prefix(self) -> None:
+        """Trailing ** is equivalent to * in fnmatch and becomes a prefix too."""
+        prefixes, _ = split_patterns(["/usr/**"])
+        assert prefixes == (normalize_for_match("/usr/*")[:-1],)
+
+    def test_prefix_matches_nested_paths(self) -> None:
+        """Prefix patterns block nested paths, like fnmatch's * does."""
+        cfg = SecurityConfig(blocked_patterns=["/opt/blocked/*"])
+        assert cfg.is_path_blocked("/opt/blocked/a/b/c.txt")
+        assert not cfg.is_path_blocked("/opt/blockedness/c.txt")
+
+    def test_complex_patterns_share_one_regex(self) -> None:
+        """Patterns with wildcards elsewhere are combined into one regex."""
+        prefixes, regex = split_patterns(["/data/*.csv", "/tmp/?/*"])
+        assert prefixes == ()
+        assert regex.match(normalize_for_match("/data/out.csv"))
+        assert regex.match(normalize_for_match("/tmp/a/b.txt"))
+        assert not regex.match(normalize_for_match("/data/out.txt"))
+
+
 class TestSecurityConfig:
     """Tests for SecurityConfig dataclass."""
 
@@ -184,6 +251,20 @@ class TestSecurityConfig:
         result2 = cfg.blocked_expanded
         assert result1 is result2  # Same object (cached)
 
+    def test_defaults_shared_not_copied(self) -> None:
+        """Default pattern collections are shared immutable tuples."""
+        cfg1 = SecurityConfig()
+        cfg2 = SecurityConfig()
+        assert isinstance(cfg1.blocked_patterns, tuple)
+        assert cfg1.blocked_patterns is cfg2.blocked_patterns
+        assert cfg1.allowed_write_patterns is cfg2.allowed_write_patterns
+
+    def test_frozen(self) -> None:
+        """Config cannot be mutated after its derived state is built."""
+        cfg = SecurityConfig()
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            cfg.mode = "sandboxed"  # type: ignore[misc]
+
     def test_allowed_write_expanded_cached(self) -> None:
         """allowed_write_expanded is a cached property."""
         cfg = SecurityConfig()
@@ -287,6 +368,19 @@ class TestLoadConfig:
             # Still has defaults
             assert len(cfg.blocked_patterns) > 2
 
+    def test_deduplicates_patterns(self) -> None:
+        """Repeated patterns are dropped, keeping first-seen order."""
+        with patch.dict(
+            os.environ,
+            {
+                "ARCHICAD_MCP_BLOCKED_PATHS": "~/.ssh/*;~/.ssh/*",
+                "ARCHICAD_MCP_ALLOWED_WRITE_PATHS": "~/Output/*;D:/Projects/*;~/Output/*",
+            },
+        ):
+            cfg = load_config()
+            assert cfg.blocked_patterns.count("~/.ssh/*") == 1
+            assert cfg.allowed_write_patterns == ["~/Output/*", "D:/Projects/*"]
+
     def test_reads_allowed_write_paths(self) -> None:
         """Reads ARCHICAD_MCP_ALLOWED_WRITE_PATHS (replaces defaults)."""
         with patch.dict(
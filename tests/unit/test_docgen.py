@@ -0,0 +1,119 @@
+"""Unit tests for execute_script docstring generation."""
+
+import pytest
+
+from archicad_mcp.schemas.cache import SchemaCache
+from archicad_mcp.schemas.docgen import generate_compact_schema, generate_execute_script_docs
+
+
+@pytest.fixture
+def cache() -> SchemaCache:
+    """Create and load a SchemaCache instance."""
+    c = SchemaCache()
+    c.load_embedded()
+    return c
+
+
+class TestGenerateCompactSchema:
+    """Tests for compact command signatures."""
+
+    def test_signature_and_returns(self) -> None:
+        """Should render parameters, return type and description."""
+        cmd = {
+            "description": "Creates columns.",
+            "parameters": {
+                "type": "object",
+                "properties": {"height": {"type": "number"}, "count": {"type": "integer"}},
+            },
+            "returns": {"$ref": "#/ExecutionResult"},
+        }
+        assert generate_compact_schema("CreateThings", cmd) == (
+            "CreateThings(height: num, count: int)\n  -> {success: bool}\n  Creates columns."
+        )
+
+    def test_leaf_types(self) -> None:
+        """Should render primitive leaves and tolerate non-string types."""
+        props = {
+            "b": {"type": "boolean"},
+            "s": {"type": "string", "enum": ["A", "B"]},
+            "u": {"type": ["number", "null"]},
+            "o": {"oneOf": [{"type": "integer"}, {"type": "string"}]},
+        }
+        cmd = {"parameters": {"type": "object", "properties": props}}
+        assert generate_compact_schema("Do", cmd) == (
+            'Do(b: bool, s: "A"|"B", u: any, o: int)\n  -> void'
+        )
+
+    def test_resolves_common_schema_refs(self) -> None:
+        """Should expand refs from the supplied definitions."""
+        cmd = {"parameters": {"type": "object", "properties": {"p": {"$ref": "#/$defs/P"}}}}
+        defs = {"P": {"type": "object", "properties": {"x": {"type": "number"}}}}
+        assert generate_compact_schema("Do", cmd, defs) == "Do(p: {x: num})\n  -> void"
+
+    def test_ref_memo_shared_across_commands(self) -> None:
+        """Should expand a shared $ref once and reuse it from the memo."""
+        defs = {"Point": {"type": "object", "properties": {"x": {"type": "number"}}}}
+        cmd = {"parameters": {"type": "object", "properties": {"p": {"$ref": "#/Point"}}}}
+        memo: dict[tuple[str, int], str] = {}
+        assert generate_compact_schema("A", cmd, defs, memo) == "A(p: {x: num})\n  -> void"
+        assert memo == {("Point", 0): "{x: num}"}
+        memo[("Point", 0)] = "{memoized}"
+        assert generate_compact_schema("B", cmd, defs, memo) == "B(p: {memoized})\n  -> void"
+
+    def test_unresolved_ref_falls_back_to_type_name(self) -> None:
+        """Should strip only the ref prefix, not a character set."""
+        cmd = {
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "a": {"$ref": "#/$defs/Missing"},
+                    "b": {"$ref": "#/#Odd"},
+                    "c": {"$ref": "#/Plain"},
+                },
+            }
+        }
+        assert generate_compact_schema("Do", cmd, {"Other": {}}) == (
+            "Do(a: Missing, b: #Odd, c: Plain)\n  -> void"
+        )
+
+
+class TestGenerateExecuteScriptDocs:
+    """Tests for the full execute_script docstring."""
+
+    def test_lists_both_apis(self, cache: SchemaCache) -> None:
+        """Should include Tapir and built-in command signatures."""
+        docs = generate_execute_script_docs(cache)
+        assert "\nCreateColumns(" in docs
+        assert "\nAPI.GetAllElements(" in docs
+
+    def test_doc_plans_sorted(self, cache: SchemaCache) -> None:
+        """Should group each API's commands by sorted category, then sorted name."""
+        plan = cache._doc_plans["tapir"]
+        assert [cat for cat, _ in plan] == sorted(cat for cat, _ in plan)
+        for _cat, cmds in plan:
+            names = [name for name, _ in cmds]
+            assert names == sorted(names)
+            assert all(cache.commands[name]["api"] == "tapir" for name in names)
+        assert sum(len(cmds) for _, cmds in cache._doc_plans["builtin"]) == sum(
+            cmd["api"] == "builtin" for cmd in cache.commands.values()
+        )
+
+    def test_compact_schemas_memoized_until_reload(self, cache: SchemaCache) -> None:
+        """Should reuse compact schemas across calls and drop them on rebuild."""
+        first = generate_execute_script_docs(cache)
+        assert "CreateColumns" in cache._compact_schemas
+        cache._compact_schemas["CreateColumns"] = "CreateColumns(memoized)"
+        cache._script_docs.clear()
+        assert "CreateColumns(memoized)" in generate_execute_script_docs(cache)
+        cache._rebuild_index()
+        assert generate_execute_script_docs(cache) == first
+
+    def test_docs_cached_per_file_access_docs(self, cache: SchemaCache) -> None:
+        """Should return the cached docstring until the schemas reload."""
+        docs = generate_execute_script_docs(cache, "FILE ACCESS")
+        assert generate_execute_script_docs(cache, "FILE ACCESS") is docs
+        assert "FILE ACCESS" not in generate_execute_script_docs(cache)
+        cache._rebuild_index()
+        rebuilt = generate_execute_script_docs(cache, "FILE ACCESS")
+        assert rebuilt is not docs
+        assert rebuilt == docs
@@ -4,7 +4,8 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from archicad_mcp.scripting.executor import ScriptExecutor
+from archicad_mcp.config import SecurityConfig
+from archicad_mcp.scripting.executor import ScriptExecutor, _compile_cached, _wrap_script_cached
 
 
 @pytest.fixture
@@ -68,6 +69,22 @@ result = x + y
         assert res.success is True
         assert res.result == {"count": 5, "items": [1, 2, 3]}
 
+    async def test_repeated_script_reuses_compiled_code(
+        self, executor: ScriptExecutor, mock_connection: MagicMock
+    ) -> None:
+        """Running the same script twice wraps and compiles once, runs stay isolated."""
+        _wrap_script_cached.cache_clear()
+        _compile_cached.cache_clear()
+        script = "counter = globals().get('counter', 0) + 1\nresult = counter"
+        first = await executor.run(script, mock_connection)
+        second = await executor.run(script, mock_connection)
+
+        assert first.result == 1
+        assert second.result == 1
+        for cached in (_wrap_script_cached, _compile_cached):
+            info = cached.cache_info()
+            assert (info.misses, info.hits) == (1, 1)
+
 
 class TestAsyncExecution:
     """Tests for async/await support."""
@@ -150,6 +167,33 @@ result = count
         assert res.success is True
         assert "Found 5 items in test" in res.stdout
 
+    async def test_print_keyword_arguments(
+        self, executor: ScriptExecutor, mock_connection: MagicMock
+    ) -> None:
+        """sep/end are honored and an explicit file= is rejected."""
+        script = """
+print("a", "b", sep="-", end="!")
+print("elsewhere", file=io.StringIO())
+"""
+        res = await executor.run(script, mock_connection)
+
+        assert res.success is False
+        assert res.stdout == "a-b!"
+        assert "multiple values for keyword argument 'file'" in res.error
+
+    async def test_print_file_none_does_not_escape_capture(
+        self,
+        executor: ScriptExecutor,
+        mock_connection: MagicMock,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """print(file=None) must not reach the server's real stdout."""
+        script = 'print("LEAKED-TO-REAL-STDOUT", file=None)'
+        res = await executor.run(script, mock_connection, config=SecurityConfig(mode="sandboxed"))
+
+        assert res.success is False
+        assert "LEAKED-TO-REAL-STDOUT" not in capsys.readouterr().out
+
 
 class TestErrorHandling:
     """Tests for error handling."""
@@ -184,6 +228,24 @@ result = z
         assert "ZeroDivisionError" in res.error
         assert "Line" in res.error
 
+    async def test_runtime_error_maps_to_script_line(
+        self, executor: ScriptExecutor, mock_connection: MagicMock
+    ) -> None:
+        """Reported line number and source refer to the user script, not the wrapper."""
+        script = "x = 1\n\nz = x / 0\nresult = z"
+        res = await executor.run(script, mock_connection)
+
+        assert res.error == "Line 3: ZeroDivisionError: division by zero\n  > z = x / 0"
+
+    async def test_error_in_script_function_reports_innermost_line(
+        self, executor: ScriptExecutor, mock_connection: MagicMock
+    ) -> None:
+        """Errors raised inside script-defined functions point at the raising line."""
+        script = "def f(d):\n    return d['missing']\n\nresult = f({})"
+        res = await executor.run(script, mock_connection)
+
+        assert res.error == "Line 2: KeyError: 'missing'\n  > return d['missing']"
+
     async def test_name_error(self, executor: ScriptExecutor, mock_connection: MagicMock) -> None:
         """Undefined variable error is caught."""
         script = "result = undefined_var"
@@ -260,6 +322,17 @@ class TestResultTruncation:
         assert len(res.result["sample"]) == 50
         assert "warning" in res.result
 
+    async def test_large_tuple_truncated(
+        self, executor: ScriptExecutor, mock_connection: MagicMock
+    ) -> None:
+        """Tuples over 500 items are truncated like lists."""
+        script = "result = tuple(range(1000))"
+        res = await executor.run(script, mock_connection)
+
+        assert res.success is True
+        assert res.result["total"] == 1000
+        assert res.result["sample"] == list(range(50))
+
     async def test_dict_not_truncated(
         self, executor: ScriptExecutor, mock_connection: MagicMock
     ) -> None:
@@ -309,6 +382,27 @@ result = str(p.name)
         assert res.success is True
         assert res.result == "file.txt"
 
+    async def test_rebinding_module_does_not_leak_between_runs(
+        self, executor: ScriptExecutor, mock_connection: MagicMock
+    ) -> None:
+        """Each run starts from a fresh namespace even if a script rebinds a module."""
+        await executor.run("json = None", mock_connection)
+        res = await executor.run("result = json.dumps([1])", mock_connection)
+
+        assert res.success is True
+        assert res.result == "[1]"
+
+    async def test_sandboxed_import_lists_available_modules(
+        self, executor: ScriptExecutor, mock_connection: MagicMock
+    ) -> None:
+        """Rejected imports in sandboxed mode name the importable modules."""
+        script = "import os"
+        res = await executor.run(script, mock_connection, config=SecurityConfig(mode="sandboxed"))
+
+        assert res.success is False
+        assert "Module 'os' is not available" in res.error
+        assert "Available: collections, copy, csv, datetime" in res.error
+
     async def test_itertools_module(
         self, executor: ScriptExecutor, mock_connection: MagicMock
     ) -> None:
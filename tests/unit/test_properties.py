@@ -1,13 +1,21 @@
 """Unit tests for property discovery and caching."""
 
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
 from archicad_mcp.core.properties import (
     PropertyCache,
     _format_property,
+    build_name_index,
+    build_property_buckets,
+    build_word_index,
     exact_lookup,
     filter_properties,
     find_similar_groups,
     get_groups_summary,
     get_type_summary,
+    prepare_properties,
     search_properties,
 )
 
@@ -91,6 +99,17 @@ class TestFormatProperty:
         assert formatted["type"] == "Custom"
         assert formatted["editable"] is True
 
+    def test_format_prepared_property(self) -> None:
+        """Prepared properties use the precomputed GUID."""
+        raw = prepare_properties([{"propertyId": {"guid": "ABC"}, "propertyName": "Test"}])[0]
+        assert raw["_guid"] == "ABC"
+        assert _format_property(raw)["guid"] == "ABC"
+
+    def test_format_malformed_property_id(self) -> None:
+        """A non-dict propertyId yields an empty GUID."""
+        raw = prepare_properties([{"propertyId": "ABC", "propertyName": "Test"}])[0]
+        assert _format_property(raw)["guid"] == ""
+
     def test_format_property_missing_fields(self) -> None:
         """Format property with missing optional fields."""
         raw = {"propertyId": {"guid": "123"}, "propertyName": "Test"}
@@ -103,6 +122,33 @@ class TestFormatProperty:
         assert formatted["measure_type"] == "Default"
 
 
+class TestPrepareProperties:
+    """Tests for prepare_properties function."""
+
+    def test_adds_normalized_keys(self) -> None:
+        """Adds lowercase name and group keys."""
+        props = prepare_properties([{"propertyName": "Zone Name", "propertyGroupName": "Zone"}])
+        assert props[0]["_name_lower"] == "zone name"
+        assert props[0]["_group_lower"] == "zone"
+
+    def test_interns_low_cardinality_fields(self) -> None:
+        """Equal group and type strings share one object after preparing."""
+        props = prepare_properties(
+            [
+                {"propertyGroupName": "".join(["Wa", "ll"]), "propertyType": "Custom"},
+                {"propertyGroupName": "".join(["W", "all"]), "propertyType": "Custom"},
+            ]
+        )
+        assert props[0]["propertyGroupName"] is props[1]["propertyGroupName"]
+        assert "propertyMeasureType" not in props[0]
+
+    def test_idempotent(self) -> None:
+        """Already prepared properties are not recomputed."""
+        props = [{"propertyName": "A", "_name_lower": "kept", "_group_lower": ""}]
+        prepare_properties(props)
+        assert props[0]["_name_lower"] == "kept"
+
+
 class TestFilterProperties:
     """Tests for filter_properties function."""
 
@@ -145,6 +191,44 @@ class TestFilterProperties:
         assert len(results) == 1
         assert results[0]["propertyName"] == "Outside Face Surface Area"
 
+    def test_no_filters_returns_all(self) -> None:
+        """No active filters returns every property."""
+        results = filter_properties(SAMPLE_PROPERTIES)
+        assert len(results) == len(SAMPLE_PROPERTIES)
+
+    def test_filter_all_three(self) -> None:
+        """Group, type, and measure filters apply together."""
+        results = filter_properties(
+            SAMPLE_PROPERTIES,
+            group="wall",
+            property_type="StaticBuiltIn",
+            measure_type="Length",
+        )
+        assert [p["propertyName"] for p in results] == ["Length of Reference Line"]
+
+    def test_buckets_give_same_results(self) -> None:
+        """Bucketed filtering matches a full scan for every combination."""
+        buckets = build_property_buckets(SAMPLE_PROPERTIES)
+        for group in [None, "wall", "a", "Beam"]:
+            for property_type in [None, "StaticBuiltIn", "Custom"]:
+                for measure_type in [None, "Area", "Default", "Volume"]:
+                    kwargs = {
+                        "group": group,
+                        "property_type": property_type,
+                        "measure_type": measure_type,
+                    }
+                    assert filter_properties(
+                        SAMPLE_PROPERTIES, buckets=buckets, **kwargs
+                    ) == filter_properties(SAMPLE_PROPERTIES, **kwargs)
+
+    def test_buckets_skip_full_prepare_pass(self) -> None:
+        """Bucketed filtering only touches the selected bucket."""
+        buckets = build_property_buckets(SAMPLE_PROPERTIES)
+        with patch("archicad_mcp.core.properties.prepare_properties") as prepare:
+            results = filter_properties(SAMPLE_PROPERTIES, group="wall", buckets=buckets)
+        prepare.assert_not_called()
+        assert results == filter_properties(SAMPLE_PROPERTIES, group="wall")
+
     def test_filter_no_match(self) -> None:
         """Filters with no matches return empty list."""
         results = filter_properties(SAMPLE_PROPERTIES, group="Beam")
@@ -176,6 +260,22 @@ class TestSearchProperties:
         assert "Outside Face Surface Area" in names
         assert "Top Surface Area" in names
 
+    def test_token_score_counts_matched_tokens(self) -> None:
+        """Each query token found in the name adds to the score."""
+        results = {
+            p["propertyName"]: score
+            for p, score in search_properties(SAMPLE_PROPERTIES, "surface top")
+        }
+        assert results["Top Surface Area"] == 200
+        assert results["Outside Face Surface Area"] == 100
+
+    def test_regex_characters_in_query(self) -> None:
+        """Query tokens are matched literally."""
+        for query in ["a.ea", "(area"]:
+            results = search_properties(SAMPLE_PROPERTIES, query)
+            # Only fuzzy matches (score < 100), no regex hits
+            assert all(score < 100 for _, score in results)
+
     def test_no_match_returns_empty(self) -> None:
         """No matches returns empty list."""
         results = search_properties(SAMPLE_PROPERTIES, "banana")
@@ -188,6 +288,36 @@ class TestSearchProperties:
             scores = [score for _, score in results]
             assert scores == sorted(scores, reverse=True)
 
+    def test_fuzzy_match_on_typo(self) -> None:
+        """Typos are caught by fuzzy matching."""
+        results = search_properties(SAMPLE_PROPERTIES, "Surfce")
+        assert {p["propertyName"] for p, _ in results} == {
+            "Outside Face Surface Area",
+            "Top Surface Area",
+        }
+
+    def test_no_fuzzy_without_rapidfuzz(self) -> None:
+        """Search still works when rapidfuzz is unavailable."""
+        with patch("archicad_mcp.core.properties._fuzz", None):
+            assert search_properties(SAMPLE_PROPERTIES, "Surfce") == []
+            assert len(search_properties(SAMPLE_PROPERTIES, "area")) > 0
+
+    def test_word_index_gives_same_results(self) -> None:
+        """Searching with a word index matches a plain scan."""
+        index = build_word_index(SAMPLE_PROPERTIES)
+        for query in ["Zone Name", "area", "urfac", "face area", "Zone Nmae", "banana"]:
+            assert search_properties(SAMPLE_PROPERTIES, query, index) == search_properties(
+                SAMPLE_PROPERTIES, query
+            )
+
+    def test_word_index_with_filtered_subset(self) -> None:
+        """An index over all properties works for a filtered subset."""
+        index = build_word_index(SAMPLE_PROPERTIES)
+        subset = filter_properties(SAMPLE_PROPERTIES, property_type="StaticBuiltIn")
+        results = search_properties(subset, "area", index)
+        assert results == search_properties(subset, "area")
+        assert all(p in subset for p, _ in results)
+
 
 class TestExactLookup:
     """Tests for exact_lookup function."""
@@ -214,6 +344,22 @@ class TestExactLookup:
         result = exact_lookup(SAMPLE_PROPERTIES, "Length")
         assert result is None
 
+    def test_lookup_with_name_index(self) -> None:
+        """Name index gives the same answers as a scan."""
+        index = build_name_index(SAMPLE_PROPERTIES)
+        for name in ["Length of Reference Line", " zone NAME ", "Length", "Nonexistent"]:
+            assert exact_lookup(SAMPLE_PROPERTIES, name, index) is exact_lookup(
+                SAMPLE_PROPERTIES, name
+            )
+
+    def test_name_index_keeps_first_duplicate(self) -> None:
+        """Duplicate names resolve to the first property, like a scan."""
+        props = [
+            {"propertyName": "Area", "propertyGroupName": "A"},
+            {"propertyName": "area", "propertyGroupName": "B"},
+        ]
+        assert build_name_index(props)["area"]["propertyGroupName"] == "A"
+
 
 class TestGetGroupsSummary:
     """Tests for get_groups_summary function."""
@@ -259,6 +405,11 @@ class TestFindSimilarGroups:
         similar = find_similar_groups(SAMPLE_PROPERTIES, "Cost")
         assert "Cost Estimation" in similar
 
+    def test_find_similar_by_fuzzy_match(self) -> None:
+        """Misspelled group names fall back to fuzzy matching."""
+        similar = find_similar_groups(SAMPLE_PROPERTIES, "Wlal")
+        assert similar == ["Wall"]
+
     def test_no_similar_returns_empty(self) -> None:
         """No similar groups returns empty list."""
         similar = find_similar_groups(SAMPLE_PROPERTIES, "xyz")
@@ -292,6 +443,36 @@ class TestPropertyCache:
         assert 19723 not in cache._cache
         assert 19724 in cache._cache
 
+    def test_summaries_computed_once(self) -> None:
+        """Summaries are reused until the port is cleared."""
+        cache = PropertyCache()
+        cache._cache[19723] = list(SAMPLE_PROPERTIES)
+
+        groups = cache.get_groups_summary(19723)
+        assert cache.get_groups_summary(19723) is groups
+        assert cache.get_type_summary(19723) == {"StaticBuiltIn": 4, "Custom": 1}
+
+        cache.clear(19723)
+        assert cache.get_groups_summary(19723) == []
+        assert cache.get_type_summary(19723) == {}
+
+    def test_summaries_empty_before_fetch(self) -> None:
+        """Uncached ports give empty summaries without caching them."""
+        cache = PropertyCache()
+        assert cache.get_groups_summary(19723) == []
+        cache._cache[19723] = list(SAMPLE_PROPERTIES)
+        assert len(cache.get_groups_summary(19723)) == 4
+
+    def test_word_index_cleared_with_port(self) -> None:
+        """Clear drops the word index alongside the properties."""
+        cache = PropertyCache()
+        cache._cache[19723] = []
+        cache._word_indexes[19723] = {}
+
+        cache.clear(19723)
+
+        assert cache.get_word_index(19723) is None
+
     def test_clear_all(self) -> None:
         """Clear without port removes all."""
         cache = PropertyCache()
@@ -301,3 +482,95 @@ class TestPropertyCache:
         cache.clear()
 
         assert len(cache._cache) == 0
+
+    async def test_prefetch_fetches_uncached_ports(self) -> None:
+        """Prefetch fills every uncached port and skips failures."""
+        ok = MagicMock(port=19723)
+        ok.execute = AsyncMock(return_value={"properties": list(SAMPLE_PROPERTIES)})
+        failing = MagicMock(port=19724)
+        failing.execute = AsyncMock(side_effect=RuntimeError("boom"))
+        cached = MagicMock(port=19725)
+        cached.execute = AsyncMock()
+        cache = PropertyCache()
+        cache._cache[19725] = []
+
+        await cache.prefetch([ok, failing, cached])
+
+        assert len(cache._cache[19723]) == len(SAMPLE_PROPERTIES)
+        assert cache.get_name_index(19723) is not None
+        assert 19724 not in cache._cache
+        cached.execute.assert_not_called()
+
+        # Cached ports are served without another request
+        assert await cache.get_properties(ok) is cache._cache[19723]
+        ok.execute.assert_awaited_once()
+
+    async def test_get_properties_joins_inflight_prefetch(self) -> None:
+        """A lookup overlapping the prefetch reuses its request."""
+        release = asyncio.Event()
+
+        async def slow_execute(command: str, params: dict[str, Any]) -> dict[str, Any]:
+            await release.wait()
+            return {"properties": list(SAMPLE_PROPERTIES)}
+
+        conn = MagicMock(port=19723)
+        conn.execute = AsyncMock(side_effect=slow_execute)
+        cache = PropertyCache()
+
+        prefetch = asyncio.create_task(cache.prefetch([conn]))
+        lookup = asyncio.create_task(cache.get_properties(conn))
+        await asyncio.sleep(0)
+        release.set()
+        await prefetch
+
+        assert await lookup is cache._cache[19723]
+        conn.execute.assert_awaited_once()
+        assert cache._fetches == {}
+
+    async def test_failed_fetch_retried_by_next_lookup(self) -> None:
+        """A failed fetch is not remembered; the next lookup asks again."""
+        conn = MagicMock(port=19723)
+        conn.execute = AsyncMock(
+            side_effect=[RuntimeError("busy"), {"properties": list(SAMPLE_PROPERTIES)}]
+        )
+        cache = PropertyCache()
+
+        await cache.prefetch([conn])
+        assert 19723 not in cache._cache
+
+        assert len(await cache.get_properties(conn)) == len(SAMPLE_PROPERTIES)
+        assert conn.execute.await_count == 2
+
+    async def test_cancelled_lookup_keeps_shared_fetch(self) -> None:
+        """Cancelling one waiter doesn't abort the fetch other callers share."""
+        release = asyncio.Event()
+
+        async def slow_execute(command: str, params: dict[str, Any]) -> dict[str, Any]:
+            await release.wait()
+            return {"properties": list(SAMPLE_PROPERTIES)}
+
+        conn = MagicMock(port=19723)
+        conn.execute = AsyncMock(side_effect=slow_execute)
+        cache = PropertyCache()
+
+        first = asyncio.create_task(cache.get_properties(conn))
+        second = asyncio.create_task(cache.get_properties(conn))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert len(await second) == len(SAMPLE_PROPERTIES)
+        conn.execute.assert_awaited_once()
+
+    def test_similar_groups_memoized_per_query(self) -> None:
+        """Repeated bad queries reuse the first suggestion list."""
+        cache = PropertyCache()
+        cache._cache[19723] = list(SAMPLE_PROPERTIES)
+
+        first = cache.get_similar_groups(19723, "Wal")
+        assert first == ["Wall"]
+        assert cache.get_similar_groups(19723, " wal ") is first
+        assert cache.get_similar_groups(19724, "Wal") == []
+
+        cache.clear(19723)
+        assert cache.get_similar_groups(19723, "Wal") == []
@@ -208,3 +208,14 @@ class TestSafeOpenPathHandling:
 
         error_msg = str(exc_info.value)
         assert "Desktop" in error_msg or "Documents" in error_msg
+
+    def test_error_message_lists_custom_blocked_patterns(self, tmp_path: Path) -> None:
+        """Blocked-read error lists every configured blocked pattern."""
+        blocked = [f"{tmp_path.as_posix()}/*", "/nonexistent/other/*"]
+        config = SecurityConfig(mode="unrestricted", blocked_patterns=blocked)
+        safe_open = _create_safe_open(config)
+
+        with pytest.raises(PermissionError) as exc_info:
+            safe_open(str(tmp_path / "secret.txt"), "r")
+
+        assert str(exc_info.value).endswith(f"Blocked: {', '.join(config.blocked_expanded)}")
@@ -1,8 +1,21 @@
 """Unit tests for SchemaCache."""
 
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
 import pytest
 
-from archicad_mcp.schemas.cache import SchemaCache
+from archicad_mcp.schemas.cache import (
+    SchemaCache,
+    _load_json_file,
+    _load_json_file_stdlib,
+    _matches_file,
+    _write_atomic,
+)
+from archicad_mcp.schemas.search import SearchIndex, _iter_text, tokenize
 
 
 @pytest.fixture
@@ -35,6 +48,13 @@ class TestLoadEmbedded:
         assert len(cache.categories) > 0
         assert "Element Commands" in cache.categories
 
+    def test_categories_interned(self, cache: SchemaCache) -> None:
+        """Should share one string object per category across commands."""
+        first = cache.commands["CreateColumns"]["category"]
+        same = [c for c in cache.commands.values() if c.get("category") == first]
+        assert len(same) > 1
+        assert all(c["category"] is first for c in same)
+
     def test_loads_element_types(self, cache: SchemaCache) -> None:
         """Should load element types from Tapir schema."""
         assert len(cache.element_types) > 0
@@ -65,6 +85,28 @@ class TestGetCommand:
         result = cache.get_command("NonExistentCommand")
         assert result is None
 
+    def test_resolution_cached(self, cache: SchemaCache) -> None:
+        """Should resolve a command once and reuse it until a rebuild."""
+        first = cache.get_command("CreateColumns")
+        assert first is not None
+        memo = cache._resolved["CreateColumns"]
+        second = cache.get_command("CreateColumns")
+        assert second == first
+        assert second is not None and second["parameters"] is first["parameters"]
+        assert cache._resolved["CreateColumns"] is memo
+        cache._rebuild_index()
+        cache.get_command("CreateColumns")
+        assert cache._resolved["CreateColumns"] is not memo
+
+    def test_mutating_result_does_not_corrupt_cache(self, cache: SchemaCache) -> None:
+        """Should hand out copies so caller edits don't leak into later lookups."""
+        first = cache.get_command("CreateColumns")
+        assert first is not None
+        expected = dict(first)
+        first.pop("parameters")
+        first["annotated"] = True
+        assert cache.get_command("CreateColumns") == expected
+
     def test_includes_enriched_fields(self, cache: SchemaCache) -> None:
         """Should include parameters and returns for commands with schemas."""
         result = cache.get_command("CreateColumns")
@@ -75,6 +117,81 @@ class TestGetCommand:
         # assert "example" in result
 
 
+class TestResolveRefs:
+    """Tests for $ref resolution."""
+
+    def test_resolves_tapir_and_builtin_refs(self) -> None:
+        """Should replace refs with their definitions and keep siblings."""
+        cache = SchemaCache()
+        cache.common_schemas = {"Guid": {"type": "string"}}
+        cache.builtin_defs = {"Kind": {"enum": ["A", "B"]}}
+        cache._rebuild_index()
+        schema = {
+            "properties": {
+                "id": {"$ref": "#/Guid", "description": "Element id"},
+                "kinds": {"type": "array", "items": {"$ref": "#/$defs/Kind"}},
+            }
+        }
+        resolved = cache._resolve_refs(schema)
+        assert resolved["properties"]["id"] == {"type": "string", "description": "Element id"}
+        assert resolved["properties"]["kinds"]["items"] == {"enum": ["A", "B"]}
+        # Source schema is left untouched
+        assert schema["properties"]["id"] == {"$ref": "#/Guid", "description": "Element id"}
+
+    def test_ref_free_subtrees_are_shared(self) -> None:
+        """Should return subtrees without refs unchanged, without copying."""
+        cache = SchemaCache()
+        cache.common_schemas = {"Guid": {"type": "string"}}
+        cache._rebuild_index()
+        plain = {"type": "object", "required": ["a"], "properties": {"a": {"type": "number"}}}
+        schema = {"plain": plain, "ref": {"$ref": "#/Guid"}}
+        resolved = cache._resolve_refs(schema)
+        assert resolved is not schema
+        assert resolved["plain"] is plain
+        assert cache._resolve_refs(plain) is plain
+
+    def test_repeated_ref_resolved_once_per_walk(self) -> None:
+        """Should reuse a ref's resolution for siblings at the same depth."""
+        cache = SchemaCache()
+        cache.common_schemas = {"Point": {"type": "object", "properties": {"x": {"$ref": "#/N"}}}}
+        cache.common_schemas["N"] = {"type": "number"}
+        cache._rebuild_index()
+        schema = {"a": {"$ref": "#/Point"}, "b": {"$ref": "#/Point"}}
+        resolved = cache._resolve_refs(schema)
+        assert resolved["a"] is resolved["b"]
+        assert resolved["a"]["properties"]["x"] == {"type": "number"}
+
+    def test_definitions_not_mutated(self) -> None:
+        """Should resolve refs inside definitions without writing back to them."""
+        cache = SchemaCache()
+        cache.common_schemas = {
+            "Point": {"type": "object", "properties": {"x": {"$ref": "#/N"}}},
+            "N": {"type": "number"},
+        }
+        cache._rebuild_index()
+        resolved = cache._resolve_refs({"p": {"$ref": "#/Point", "description": "At"}})
+        assert resolved["p"]["properties"]["x"] == {"type": "number"}
+        assert cache.common_schemas["Point"] == {
+            "type": "object",
+            "properties": {"x": {"$ref": "#/N"}},
+        }
+
+    def test_ref_styles_do_not_cross(self) -> None:
+        """Should look up each ref style only in its own definitions."""
+        cache = SchemaCache()
+        cache.common_schemas = {"Only": {"type": "string"}}
+        cache.builtin_defs = {"Def": {"type": "number"}}
+        cache._rebuild_index()
+        schema = {"a": {"$ref": "#/$defs/Only"}, "b": {"$ref": "#/Def"}}
+        assert cache._resolve_refs(schema) is schema
+
+    def test_unknown_ref_left_as_is(self) -> None:
+        """Should keep refs that cannot be resolved."""
+        cache = SchemaCache()
+        schema = {"items": [{"$ref": "#/Missing"}]}
+        assert cache._resolve_refs(schema) is schema
+
+
 class TestGetCommands:
     """Tests for batch command lookup."""
 
@@ -93,12 +210,36 @@ class TestGetCommands:
         assert "not_found" in result
         assert "FakeCommand" in result["not_found"]
 
+    def test_matches_single_lookup(self, cache: SchemaCache) -> None:
+        """Should return the same resolved schemas as get_command."""
+        result = cache.get_commands(["CreateColumns", "API.GetAllElements"])
+        assert result["commands"][0] == cache.get_command("CreateColumns")
+        assert result["commands"][1] == cache.get_command("API.GetAllElements")
+
     def test_no_not_found_when_all_exist(self, cache: SchemaCache) -> None:
         """Should not include not_found when all commands exist."""
         result = cache.get_commands(["CreateColumns", "CreateSlabs"])
         assert "not_found" not in result
 
 
+class TestTokenize:
+    """Tests for search tokenization."""
+
+    def test_splits_on_non_alphanumerics(self) -> None:
+        """Should lowercase and split on any non-alphanumeric run."""
+        assert tokenize("Get-All  Elements_v2") == ["get", "all", "elements", "v2"]
+
+    def test_drops_single_chars(self) -> None:
+        """Should keep only tokens of at least two characters."""
+        assert tokenize("a B cd 1 23") == ["cd", "23"]
+        assert tokenize("") == []
+
+    def test_iter_text_walks_json(self) -> None:
+        """Should yield keys and scalar text in order, skipping booleans and nulls."""
+        value = {"elements": [{"guid": "Ab-1"}], "count": 3, "ok": True, "none": None}
+        assert list(_iter_text(value)) == ["elements", "guid", "Ab-1", "count", "3", "ok", "none"]
+
+
 class TestSearch:
     """Tests for search functionality."""
 
@@ -144,6 +285,81 @@ class TestSearch:
         # First result should be exact name match
         assert result["results"][0]["name"] == "CreateColumns"
 
+    def test_prefix_matches(self) -> None:
+        """Should score tokens extending the query prefix, at half weight."""
+        index = SearchIndex()
+        index.build(
+            {
+                "Walls": {"description": "walling"},
+                "Wal": {"description": "wal"},
+                "Other": {"description": "awall"},
+            },
+            [],
+        )
+        result = index.search("wal", limit=10)
+        scores = {r["name"]: r["score"] for r in result["results"]}
+        assert set(scores) == {"Walls", "Wal"}
+        assert scores["Walls"] == (SearchIndex.WEIGHT_NAME + SearchIndex.WEIGHT_DESCRIPTION) // 2
+        assert scores["Wal"] == SearchIndex.WEIGHT_NAME + SearchIndex.WEIGHT_DESCRIPTION
+
+    def test_repeated_tokens_share_one_posting(self) -> None:
+        """Should store one counted posting per field while scoring each occurrence."""
+        index = SearchIndex()
+        index.build({"Cmd": {"description": "wall wall wall", "notes": "wall"}}, [])
+        assert index.token_index["wall"] == [
+            ("Cmd", SearchIndex.FIELD_BITS["description"], SearchIndex.WEIGHT_DESCRIPTION, 3),
+            ("Cmd", SearchIndex.FIELD_BITS["notes"], SearchIndex.WEIGHT_NOTES, 1),
+        ]
+        result = index.search("wall")
+        expected = 3 * SearchIndex.WEIGHT_DESCRIPTION + SearchIndex.WEIGHT_NOTES
+        assert result["results"][0]["score"] == expected
+        assert result["results"][0]["matched_in"] == ["description", "notes"]
+
+    def test_partial_coverage_scaled(self) -> None:
+        """Should scale scores by the share of query tokens matched."""
+        index = SearchIndex()
+        index.build({"Both": {"description": "wall zone"}, "One": {"description": "wall"}}, [])
+        scores = {r["name"]: r["score"] for r in index.search("wall zone")["results"]}
+        assert scores == {
+            "Both": 2 * SearchIndex.WEIGHT_DESCRIPTION,
+            "One": SearchIndex.WEIGHT_DESCRIPTION // 2,
+        }
+
+    def test_repeated_query_tokens_score_each_occurrence(self) -> None:
+        """Should score a repeated query token per occurrence but cover it once."""
+        index = SearchIndex()
+        index.build({"Cmd": {"description": "wall"}}, [])
+        result = index.search("wall wall")
+        # Scored twice, then scaled by coverage: one distinct token over two query tokens
+        assert result["results"][0]["score"] == SearchIndex.WEIGHT_DESCRIPTION
+
+    def test_repeated_query_tokens_match_embedded_scores(self, cache: SchemaCache) -> None:
+        """Should keep baseline scores for queries that repeat a token."""
+        scores = {r["name"]: r["score"] for r in cache.search("get get", limit=200)["results"]}
+        assert scores["Get3DBoundingBoxes"] == 90
+
+    def test_fuzzy_matches_typos(self, cache: SchemaCache) -> None:
+        """Should fall back to fuzzy token matching for misspelled queries."""
+        result = cache.search("colums")
+        assert "CreateColumns" in [r["name"] for r in result["results"]]
+
+    def test_fuzzy_without_rapidfuzz(self, cache: SchemaCache) -> None:
+        """Should return no fuzzy matches when rapidfuzz is unavailable."""
+        with patch("archicad_mcp.schemas.search._fuzz", None):
+            assert cache.search("colums")["total"] == 0
+
+    def test_index_built_lazily(self, cache: SchemaCache) -> None:
+        """Should build the index on first search and reset it on rebuild."""
+        assert cache._search_index is None
+        cache.search("Column")
+        index = cache._search_index
+        assert index is not None
+        cache.search("Slab")
+        assert cache._search_index is index
+        cache._rebuild_index()
+        assert cache._search_index is None
+        assert cache.search("Column")["total"] > 0
+
 
 class TestGetCategory:
     """Tests for category filtering."""
@@ -165,6 +381,22 @@ class TestGetCategory:
         names = [c["name"] for c in result["commands"]]
         assert names == sorted(names)
 
+    def test_reflects_rebuilt_commands(self, cache: SchemaCache) -> None:
+        """Should pick up commands added before an index rebuild."""
+        cache.commands["ZZTest"] = {"name": "ZZTest", "api": "tapir", "category": "Test Only"}
+        cache._rebuild_index()
+        result = cache.get_category("Test Only")
+        assert [c["name"] for c in result["commands"]] == ["ZZTest"]
+        assert result["commands"][0]["has_details"] is False
+
+    def test_mutating_result_does_not_corrupt_cache(self, cache: SchemaCache) -> None:
+        """Should hand out copies of the cached listings."""
+        result = cache.get_category("Element Commands")
+        expected = [dict(c) for c in result["commands"]]
+        result["commands"][0]["annotated"] = True
+        result["commands"].pop()
+        assert cache.get_category("Element Commands")["commands"] == expected
+
     def test_empty_for_unknown_category(self, cache: SchemaCache) -> None:
         """Should return empty list for unknown category."""
         result = cache.get_category("NonExistent Category")
@@ -172,6 +404,46 @@ class TestGetCategory:
         assert len(result["commands"]) == 0
 
 
+class TestFindSimilarCategories:
+    """Tests for category typo suggestions."""
+
+    def test_suggests_by_prefix(self, cache: SchemaCache) -> None:
+        """Should suggest categories sharing the query's prefix."""
+        assert "Element Commands" in cache._find_similar_categories("Elem")
+
+    def test_fuzzy_fallback(self, cache: SchemaCache) -> None:
+        """Should fall back to fuzzy matching for typos."""
+        assert cache._find_similar_categories("lement Commands") == ["Element Commands"]
+
+    def test_at_most_three_sorted(self, cache: SchemaCache) -> None:
+        """Should return at most three suggestions in name order."""
+        similar = cache._find_similar_categories("Commands")
+        assert len(similar) == 3
+        assert similar == sorted(similar)
+
+
+class TestFindSimilarCommands:
+    """Tests for command name typo suggestions."""
+
+    def test_suggests_close_names(self, cache: SchemaCache) -> None:
+        """Should put the closest command name first."""
+        assert cache.find_similar_commands("CreateColumn")[0] == "CreateColumns"
+
+    def test_respects_limit(self, cache: SchemaCache) -> None:
+        """Should return at most `limit` names."""
+        assert len(cache.find_similar_commands("GetElements", limit=2)) == 2
+
+    def test_no_suggestions_for_unrelated_query(self, cache: SchemaCache) -> None:
+        """Should return nothing below the similarity cutoff."""
+        assert cache.find_similar_commands("qqqqqqqqqqqqqqqqqqqq") == []
+
+    def test_sees_commands_added_by_rebuild(self, cache: SchemaCache) -> None:
+        """Should suggest names from the latest index rebuild."""
+        cache.commands["ZzzFrobnicate"] = {"name": "ZzzFrobnicate", "api": "tapir"}
+        cache._rebuild_index()
+        assert cache.find_similar_commands("zzzfrobnicat")[0] == "ZzzFrobnicate"
+
+
 class TestGetSummary:
     """Tests for summary generation."""
 
@@ -201,11 +473,27 @@ class TestGetSummary:
         assert "element_types" in result
         assert "Wall" in result["element_types"]
 
+    def test_counts_match_commands(self, cache: SchemaCache) -> None:
+        """Should count every command once by API and by category."""
+        result = cache.get_summary()
+        assert result["tapir_commands"] + result["builtin_commands"] == result["total_commands"]
+        assert sum(result["categories"].values()) == result["total_commands"]
+        assert tuple(sorted(result["categories"])) == cache.categories
+
     def test_includes_tip(self, cache: SchemaCache) -> None:
         """Should include usage tip."""
         result = cache.get_summary()
         assert "tip" in result
 
+    def test_mutating_result_does_not_corrupt_cache(self, cache: SchemaCache) -> None:
+        """Should return a fresh summary each call."""
+        result = cache.get_summary()
+        result.pop("tip")
+        result["categories"].clear()
+        again = cache.get_summary()
+        assert "tip" in again
+        assert sum(again["categories"].values()) == again["total_commands"]
+
 
 class TestAutoLoad:
     """Tests for automatic loading."""
@@ -228,3 +516,95 @@ class TestAutoLoad:
         cache = SchemaCache()
         result = cache.get_summary()
         assert result["total_commands"] > 0
+
+
+class TestParseJsVar:
+    """Tests for parsing Tapir's generated JS documentation files."""
+
+    def test_parses_array(self) -> None:
+        """Should extract the JSON array from a var assignment."""
+        content = b'var gCommands = [{"name": "Group", "commands": []}];'
+        assert SchemaCache()._parse_js_var(content) == [{"name": "Group", "commands": []}]
+
+    def test_parses_object_without_semicolon(self) -> None:
+        """Should accept a trailing assignment without semicolon."""
+        content = b'var gSchemaDefinitions = {"ElementType": {"enum": ["Wall"]}}'
+        assert SchemaCache()._parse_js_var(content) == {"ElementType": {"enum": ["Wall"]}}
+
+    def test_tolerates_trailing_whitespace(self) -> None:
+        """Should strip whitespace around the closing semicolon."""
+        content = b'// generated\nvar gCommands = ["a", "b"];\n\n'
+        assert SchemaCache()._parse_js_var(content) == ["a", "b"]
+
+    def test_invalid_json_returns_none(self) -> None:
+        """Should return None for malformed payloads."""
+        assert SchemaCache()._parse_js_var(b"var gCommands = [oops];") is None
+        assert SchemaCache()._parse_js_var(b"no assignment here") is None
+
+
+class TestLoadJsonFile:
+    """Tests for schema file parsing."""
+
+    @pytest.mark.parametrize("load", [_load_json_file, _load_json_file_stdlib])
+    def test_parses_file(self, tmp_path: Path, load: Callable[[Path], Any]) -> None:
+        """Should parse the file contents with either parser."""
+        target = tmp_path / "tapir.json"
+        target.write_text('{"commands": {"A": {"category": "Ä"}}}', encoding="utf-8")
+        assert load(target) == {"commands": {"A": {"category": "Ä"}}}
+
+    @pytest.mark.parametrize("load", [_load_json_file, _load_json_file_stdlib])
+    def test_empty_file_raises_decode_error(
+        self, tmp_path: Path, load: Callable[[Path], Any]
+    ) -> None:
+        """Should report an empty file as a JSON decode error."""
+        target = tmp_path / "tapir.json"
+        target.write_bytes(b"")
+        with pytest.raises(json.JSONDecodeError):
+            load(target)
+
+
+class TestWriteAtomic:
+    """Tests for atomic cache file writes."""
+
+    def test_replaces_file(self, tmp_path: Path) -> None:
+        """Should replace the target and leave no temp file behind."""
+        target = tmp_path / "tapir.json"
+        target.write_bytes(b"old")
+        _write_atomic(target, b"new")
+        assert target.read_bytes() == b"new"
+        assert list(tmp_path.iterdir()) == [target]
+
+    def test_keeps_original_on_failure(self, tmp_path: Path) -> None:
+        """Should leave the previous file intact if the rename fails."""
+        target = tmp_path / "tapir.json"
+        target.write_bytes(b"old")
+        with (
+            patch("archicad_mcp.schemas.cache.os.replace", side_effect=OSError("busy")),
+            pytest.raises(OSError),
+        ):
+            _write_atomic(target, b"new")
+        assert target.read_bytes() == b"old"
+        assert list(tmp_path.iterdir()) == [target]
+
+
+class TestSkipUnchangedWrite:
+    """Tests for skipping cache writes when content is unchanged."""
+
+    def test_matches_file(self, tmp_path: Path) -> None:
+        """Should match only identical content."""
+        target = tmp_path / "tapir.json"
+        assert not _matches_file(target, b"data")
+        target.write_bytes(b"data")
+        assert _matches_file(target, b"data")
+        assert not _matches_file(target, b"date")
+        assert not _matches_file(target, b"data!")
+
+    def test_save_skips_unchanged(self) -> None:
+        """Should not rewrite the cache file when content is unchanged."""
+        cache = SchemaCache()
+        with (
+            patch("archicad_mcp.schemas.cache._matches_file", return_value=True),
+            patch("archicad_mcp.schemas.cache._write_atomic") as write,
+        ):
+            cache._save_tapir_cache({}, {})
+        write.assert_not_called()